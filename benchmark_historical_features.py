@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from feature_store.resource_registry import resources
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+FEATURES = [
+    "house_features:area",
+    "house_features:bedrooms",
+    "house_features:mainroad"
+]
+
+
+def build_entity_df(base: pd.DataFrame, n_rows: int, seed: int = 42) -> pd.DataFrame:
+    # Resamples recorded entities and jitters their timestamps to reach n_rows
+    rng = np.random.default_rng(seed)
+    sample = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+    jitter = pd.to_timedelta(rng.integers(0, 3 * 24 * 3600, n_rows), unit="s")
+    sample["event_timestamp"] = pd.to_datetime(sample["event_timestamp"], utc=True) + jitter
+    return sample
+
+
+def compare(feast_df: pd.DataFrame, local_df: pd.DataFrame, columns: list) -> float:
+    keys = ["house_id", "event_timestamp"]
+    left = feast_df.assign(event_timestamp=pd.to_datetime(feast_df["event_timestamp"], utc=True))
+    left = left.sort_values(keys + columns).reset_index(drop=True)
+    right = local_df.sort_values(keys + columns).reset_index(drop=True)
+    diff = (left[columns].astype(float) - right[columns].astype(float)).abs()
+    mismatched = (diff > 1e-6) | (left[columns].isna() != right[columns].isna())
+    return float(mismatched.any(axis=1).mean())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Feast and local point-in-time join engines")
+    parser.add_argument("--entity_counts", type=str, default="1000,10000,100000", help="Comma separated entity frame sizes")
+    parser.add_argument("--entity_path", type=str, default=os.path.join(PROJECT_ROOT, "data", "house_target.parquet"))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=str, default="benchmark_historical_results.json")
+    args = parser.parse_args()
+
+    fstore = resources.get_feature_store(os.path.join(PROJECT_ROOT, "feature_store", "feature_repo"))
+    base = fstore.get_entity_dataframe(args.entity_path, columns=["house_id", "event_timestamp"])
+    columns = [feature.split(":")[1] for feature in FEATURES]
+
+    report = {
+        "started_at": datetime.now().isoformat(),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpu_count": os.cpu_count()},
+        "features": FEATURES,
+        "results": [],
+    }
+    for n_rows in [int(n) for n in args.entity_counts.split(",")]:
+        entity_df = build_entity_df(base, n_rows)
+        timings = {"feast": [], "local": []}
+        outputs = {}
+        for _ in range(args.repeats):
+            for engine in timings:
+                start = time.perf_counter()
+                # Bypasses HISTORICAL_FEATURE_CACHE_DIR: every repeat times a real join
+                outputs[engine] = fstore.retrieve_historical_features(entity_df, FEATURES, engine=engine)
+                timings[engine].append(time.perf_counter() - start)
+
+        result = {
+            "entity_rows": n_rows,
+            "feast_seconds": min(timings["feast"]),
+            "local_seconds": min(timings["local"]),
+            "speedup": min(timings["feast"]) / min(timings["local"]),
+            "mismatch_rate": compare(outputs["feast"], outputs["local"], columns),
+        }
+        report["results"].append(result)
+        print(f"{n_rows} entities: feast {result['feast_seconds']:.3f}s, local {result['local_seconds']:.3f}s, "
+              f"speedup {result['speedup']:.1f}x, mismatch rate {result['mismatch_rate']:.4f}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results written to {args.output}")
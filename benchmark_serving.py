@@ -0,0 +1,249 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import itertools
+import threading
+import subprocess
+import tempfile
+import urllib.request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+# /predict scores rows by position in the order the model was trained on (model_serving.service.FEATURE_COLUMNS)
+PAYLOAD_COLUMNS = ["bedrooms", "mainroad", "area"]
+
+
+def load_requests(path: str = None, synthetic: int = 1000, rows_per_request: int = 1, seed: int = 42) -> list:
+    # Recorded files are JSON lines of predict payloads: {"input_data": [[bedrooms, mainroad, area], ...]}
+    if path:
+        with open(path) as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+        return [p if "input_data" in p else {"input_data": p} for p in payloads]
+
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(synthetic):
+        rows = []
+        for _ in range(rows_per_request):
+            row = {"area": rng.uniform(-2, 4), "bedrooms": rng.uniform(-2, 3), "mainroad": rng.choice([0.0, 1.0])}
+            rows.append([row[name] for name in PAYLOAD_COLUMNS])
+        payloads.append({"input_data": rows})
+    return payloads
+
+
+class ServiceProcess:
+    def __init__(self, port: int, env: dict, startup_timeout: float = 120.0):
+        self.port = port
+        self.env = env
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.time_to_ready = None
+
+    def __enter__(self):
+        start = time.monotonic()
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "bentoml", "serve", "model_serving.service:HouseService", "--port", str(self.port)],
+            cwd=PROJECT_ROOT,
+            env={**os.environ, **self.env},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        while time.monotonic() - start < self.startup_timeout:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Service exited with code {self.process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/readyz", timeout=1) as response:
+                    if response.status == 200:
+                        self.time_to_ready = time.monotonic() - start
+                        return self
+            except OSError:
+                pass
+            time.sleep(0.25)
+        self.__exit__(None, None, None)
+        raise TimeoutError(f"Service not ready after {self.startup_timeout}s")
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class LoadGenerator:
+    def __init__(self, url: str, payloads: list, timeout: float = 10.0):
+        self.url = url
+        self.bodies = [json.dumps(p).encode() for p in payloads]
+        self.rows = [len(p["input_data"]) for p in payloads]
+        self.timeout = timeout
+
+    def _send(self, index: int) -> bool:
+        request = urllib.request.Request(
+            self.url, data=self.bodies[index], headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status == 200
+        except OSError:
+            return False
+
+    def closed_loop(self, concurrency: int, duration: float) -> dict:
+        latencies, errors, rows = [], [0], [0]
+        lock = threading.Lock()
+        counter = itertools.count()
+        deadline = time.monotonic() + duration
+
+        def client():
+            while time.monotonic() < deadline:
+                index = next(counter) % len(self.bodies)
+                start = time.perf_counter()
+                ok = self._send(index)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                        rows[0] += self.rows[index]
+                    else:
+                        errors[0] += 1
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return summarize(latencies, errors[0], rows[0], time.monotonic() - start)
+
+    def open_loop(self, rate: float, duration: float, max_in_flight: int = 512) -> dict:
+        # Poisson arrivals; latency is measured from the scheduled send time to avoid coordinated omission
+        latencies, errors, rows = [], [0], [0]
+        lock = threading.Lock()
+        rng = random.Random(0)
+
+        def fire(index: int, scheduled: float):
+            ok = self._send(index)
+            elapsed = time.perf_counter() - scheduled
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                    rows[0] += self.rows[index]
+                else:
+                    errors[0] += 1
+
+        start = time.perf_counter()
+        next_send = start
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for index in itertools.cycle(range(len(self.bodies))):
+                next_send += rng.expovariate(rate)
+                if next_send - start > duration:
+                    break
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(fire, index, next_send)
+        return summarize(latencies, errors[0], rows[0], time.perf_counter() - start)
+
+
+def summarize(latencies: list, errors: int, rows: int, elapsed: float) -> dict:
+    latencies_ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if latencies else (None, None, None)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rows": rows,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "throughput_rows_per_s": rows / elapsed,
+        "latency_ms": {
+            "mean": float(latencies_ms.mean()) if latencies else None,
+            "p50": float(p50) if latencies else None,
+            "p95": float(p95) if latencies else None,
+            "p99": float(p99) if latencies else None,
+            "max": float(latencies_ms.max()) if latencies else None,
+        },
+    }
+
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(v) for v in value.split(",") if v]
+
+
+def parse_switch(value: str) -> bool:
+    return value.lower() in ("on", "true", "1", "yes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test and latency benchmark for HouseService")
+    parser.add_argument("--requests_file", type=str, help="JSON lines of recorded predict payloads (default: synthetic)")
+    parser.add_argument("--synthetic", type=int, default=1000, help="Number of synthetic payloads")
+    parser.add_argument("--rows_per_request", type=int, default=1, help="Rows per synthetic payload")
+    parser.add_argument("--batch_sizes", type=str, default="1,64", help="Comma separated HOUSE_SERVICE_MAX_BATCH_SIZE values")
+    parser.add_argument("--workers", type=str, default="1", help="Comma separated HOUSE_SERVICE_WORKERS values")
+    parser.add_argument("--feedback", type=str, default="on,off", help="Comma separated feedback logging switches")
+    parser.add_argument("--fast_path", type=str, default="off,on", help="Comma separated fast path switches")
+    parser.add_argument("--mode", type=str, default="closed,open", help="closed, open or both (comma separated)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Clients for the closed loop")
+    parser.add_argument("--rate", type=float, default=500.0, help="Requests per second for the open loop")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of unrecorded closed-loop load before each config")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--output", type=str, default="benchmark_results.json")
+    args = parser.parse_args()
+
+    payloads = load_requests(args.requests_file, args.synthetic, args.rows_per_request)
+    generator = LoadGenerator(f"http://127.0.0.1:{args.port}/predict", payloads)
+    report = {
+        "started_at": datetime.now().isoformat(),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpu_count": os.cpu_count()},
+        "requests_file": args.requests_file,
+        "payloads": len(payloads),
+        "results": [],
+    }
+
+    configs = itertools.product(
+        parse_list(args.batch_sizes, int), parse_list(args.workers), parse_list(args.feedback, parse_switch),
+        parse_list(args.fast_path, parse_switch)
+    )
+    for batch_size, workers, feedback, fast_path in configs:
+        config = {"batch_size": batch_size, "workers": workers, "feedback": feedback, "fast_path": fast_path}
+        with tempfile.TemporaryDirectory() as feedback_dir:
+            env = {
+                "HOUSE_SERVICE_MAX_BATCH_SIZE": str(batch_size),
+                "HOUSE_SERVICE_WORKERS": str(workers),
+                "HOUSE_SERVICE_FEEDBACK": "true" if feedback else "false",
+                "HOUSE_SERVICE_FEEDBACK_PATH": os.path.join(feedback_dir, "feedback"),
+                "HOUSE_SERVICE_FAST_PATH": "true" if fast_path else "false",
+                "HOUSE_SERVICE_MODEL_WATCH_INTERVAL": "0",
+            }
+            try:
+                with ServiceProcess(args.port, env) as service:
+                    generator.closed_loop(args.concurrency, args.warmup)
+                    for mode in parse_list(args.mode):
+                        if mode == "closed":
+                            result = generator.closed_loop(args.concurrency, args.duration)
+                            load = {"concurrency": args.concurrency}
+                        else:
+                            result = generator.open_loop(args.rate, args.duration)
+                            load = {"rate": args.rate}
+                        report["results"].append({**config, "mode": mode, **load, "time_to_ready_s": service.time_to_ready, **result})
+                        print(f"{config} {mode}: {result['throughput_rps']:.1f} req/s, "
+                              f"p50={result['latency_ms']['p50']} p95={result['latency_ms']['p95']} p99={result['latency_ms']['p99']} ms, "
+                              f"errors={result['errors']}")
+            except (RuntimeError, TimeoutError) as e:
+                report["results"].append({**config, "error": str(e)})
+                print(f"{config} failed: {e}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results written to {args.output}")
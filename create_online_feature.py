@@ -1,10 +1,15 @@
 import os
 import pandas as pd
-from datetime import datetime
+import sqlalchemy as db
+from datetime import datetime, timedelta
 import argparse
 
 from feature_store.feature_store import FeastFeatureStore
 from feature_store.exec_feature_store import ExecuteFeatureStore
+from feature_store.resource_registry import resources
+from feature_store.materialization import WindowedMaterializer
+from feature_store.online_replica import SQLiteOnlineReplica
+from feature_store.feature_repo.definitions import house_features
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 
@@ -14,12 +19,12 @@ class CreateOnlineFeatures:
         self._entity_df = None
 
     def set_feature_store(self, path: str) -> FeastFeatureStore:
-        self._feature_store = FeastFeatureStore(path)
+        self._feature_store = resources.get_feature_store(path)
 
         return self._feature_store
     
-    def set_entity_df(self, path: str) -> pd.DataFrame:
-        self._entity_df = self._feature_store.get_entity_dataframe(path)
+    def set_entity_df(self, path: str, columns: list = None, start_date: datetime = None, end_date: datetime = None) -> pd.DataFrame:
+        self._entity_df = self._feature_store.get_entity_dataframe(path, columns=columns, start=start_date, end=end_date)
 
         return self._entity_df
     
@@ -41,6 +46,13 @@ class CreateOnlineFeatures:
         )
 
         return online_df
+
+    def iter_online_df(self, path: str, batch_size: int = 100_000, start_date: datetime = None, end_date: datetime = None):
+        # Only house_id is read from the entity file, one memory-mapped batch at a time
+        exec_feature_store = ExecuteFeatureStore()
+        for entity_df in self._feature_store.iter_entity_batches(
+                path, columns=["house_id"], start=start_date, end=end_date, batch_size=batch_size):
+            yield exec_feature_store.get_online_features(fstore=self._feature_store, entity_df=entity_df)
     
     def materialize(self, incremental: bool, start_date: datetime, end_date: datetime):
         self._feature_store.materialize(
@@ -49,6 +61,38 @@ class CreateOnlineFeatures:
             end_date=end_date
         )
 
+    def materialize_windows(self, incremental: bool, start_date: datetime, end_date: datetime,
+                            window: timedelta, max_workers: int, checkpoint_path: str, row_counter=None):
+        materializer = WindowedMaterializer(
+            self._feature_store,
+            window=window,
+            max_workers=max_workers,
+            checkpoint_path=checkpoint_path,
+            row_counter=row_counter
+        )
+        if incremental or start_date is None:
+            start_date = materializer.incremental_start(end_date)
+        return materializer.run(start_date, end_date)
+
+    def refresh_replica(self, path: str, end_date: datetime) -> int:
+        # Rebuilds the serving replica from the rows materialization just loaded
+        replica = SQLiteOnlineReplica(path, columns=[feature.name for feature in house_features.features])
+        return replica.refresh_from_source(self._feature_store, house_features, end_date=end_date)
+
+
+def offline_row_counter(tables: dict = None):
+    # Counts source rows per feature view and window so the CLI can report rows/s
+    tables = tables or {"house_features": "house_features_sql", "house_feedback": "house_feedback_sql"}
+    engine = resources.get_engine(ExecuteFeatureStore().get_offline_connstr())
+
+    def count(view: str, start: datetime, end: datetime) -> int:
+        if view not in tables:
+            return None
+        query = db.text(f"SELECT COUNT(*) FROM {tables[view]} WHERE event_timestamp >= :start AND event_timestamp < :end")
+        with engine.connect() as connection:
+            return connection.execute(query, {"start": start, "end": end}).scalar()
+    return count
+
     
 def parse_datetime(dt_str):
     # Convert to ISO format by replacing space with T
@@ -66,6 +110,11 @@ if __name__ == "__main__":
     parser.add_argument("--increment", action="store_true", help="Enable incremental materialization")
     parser.add_argument("--start_date", type=str, help="Start date for materialization (YYYY-MM-DD)")
     parser.add_argument("--end_date", type=str, help="End date for materialization (YYYY-MM-DD)")
+    parser.add_argument("--window_hours", type=float, help="Split materialization into windows of this many hours")
+    parser.add_argument("--workers", type=int, default=4, help="Feature views materialized in parallel; the windows of one view run in order")
+    parser.add_argument("--checkpoint", type=str, default=os.path.join(str(PROJECT_ROOT), "feature_store", "materialization_checkpoint.json"), help="Checkpoint file of completed windows")
+    parser.add_argument("--count_rows", action="store_true", help="Count source rows per window to report rows/s")
+    parser.add_argument("--replica", type=str, help="Refresh the embedded SQLite online replica at this path after materializing")
     args = parser.parse_args()
 
     features=[
@@ -90,12 +139,27 @@ if __name__ == "__main__":
     start_date = parse_datetime(args.start_date) if args.start_date else None
     end_date = parse_datetime(args.end_date) if args.end_date else datetime.now()
 
-    create_online_feature.materialize(
-        incremental=args.increment, 
-        start_date=start_date, 
-        end_date=end_date
-    )
-    print("Incremental materialization completed for ", start_date, " to ", end_date)
+    if args.window_hours:
+        results = create_online_feature.materialize_windows(
+            incremental=args.increment,
+            start_date=start_date,
+            end_date=end_date,
+            window=timedelta(hours=args.window_hours),
+            max_workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            row_counter=offline_row_counter() if args.count_rows else None
+        )
+        print(f"Windowed materialization completed: {len(results)} windows materialized up to {end_date}")
+    else:
+        create_online_feature.materialize(
+            incremental=args.increment, 
+            start_date=start_date, 
+            end_date=end_date
+        )
+        print("Incremental materialization completed for ", start_date, " to ", end_date)
+
+    if args.replica:
+        create_online_feature.refresh_replica(args.replica, end_date)
     # python ./create_online_feature.py --start_date "2025-12-24 18:08:04.022307617"  --end_date "2025-12-24 18:08:04.022308000"
 
     # print(args.increment)
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+
+# Reads entity frames from Parquet without loading whole files: only the requested columns are decoded,
+# row groups whose statistics fall outside the filters are skipped, and the file is memory-mapped
+# so batches can be streamed for entity sets larger than RAM
+class ParquetEntityLoader:
+    def __init__(self, path: str, columns: list = None, start: datetime = None, end: datetime = None,
+                 filters: list = None, timestamp_column: str = "event_timestamp", memory_map: bool = True,
+                 batch_size: int = 100_000):
+        self.path = path
+        self.columns = columns
+        self.start = start
+        self.end = end
+        # pyarrow DNF filters, e.g. [("house_id", "in", [1, 2])]
+        self.filters = filters
+        self.timestamp_column = timestamp_column
+        self.batch_size = batch_size
+        self.dataset = ds.dataset(path, format="parquet", filesystem=pafs.LocalFileSystem(use_mmap=memory_map))
+
+    def _timestamp_scalar(self, value: datetime) -> pa.Scalar:
+        ts_type = self.dataset.schema.field(self.timestamp_column).type
+        value = pd.Timestamp(value)
+        if ts_type.tz is not None and value.tzinfo is None:
+            value = value.tz_localize("UTC")
+        elif ts_type.tz is None and value.tzinfo is not None:
+            value = value.tz_convert("UTC").tz_localize(None)
+        return pa.scalar(value.to_pydatetime(), type=ts_type)
+
+    def expression(self) -> ds.Expression:
+        conditions = []
+        if self.filters:
+            conditions.append(pq.filters_to_expression(self.filters))
+        if self.start is not None:
+            conditions.append(ds.field(self.timestamp_column) >= self._timestamp_scalar(self.start))
+        if self.end is not None:
+            conditions.append(ds.field(self.timestamp_column) <= self._timestamp_scalar(self.end))
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def iter_batches(self):
+        scanner = self.dataset.scanner(columns=self.columns, filter=self.expression(), batch_size=self.batch_size)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def read(self) -> pd.DataFrame:
+        return self.dataset.to_table(columns=self.columns, filter=self.expression()).to_pandas()
@@ -1,7 +1,7 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from feast import Entity, FeatureView, Field, ValueType, FileSource
+from feast import Entity, FeatureView, Field, ValueType, FileSource, PushSource
 from feast.types import Int64, Float32
 from feast.infra.offline_stores.contrib.postgres_offline_store.postgres_source import PostgreSQLSource
 
@@ -19,31 +19,61 @@ house = Entity(
 #     event_timestamp_column="event_timestamp",  # Optional: add timestamp if your data includes it
 # )
 
+house_schema = [
+    Field(name="area", dtype=Float32),
+    Field(name="bedrooms", dtype=Float32),
+    Field(name="bathrooms", dtype=Float32),
+    Field(name="stories", dtype=Float32),
+    Field(name="mainroad", dtype=Int64),
+    Field(name="guestroom", dtype=Int64),
+    Field(name="basement", dtype=Int64),
+    Field(name="hotwaterheating", dtype=Int64),
+    Field(name="airconditioning", dtype=Int64),
+    Field(name="parking", dtype=Float32),
+    Field(name="prefarea", dtype=Int64),
+    Field(name="furnishingstatus", dtype=Int64),
+]
+
+# Explicit columns instead of SELECT *, so offline reads never ship table columns outside the FeatureView
 pg_source = PostgreSQLSource(
     name = "house_features_sql",
-    query = "SELECT * FROM house_features_sql",
-    timestamp_field="event_timestamp"
+    query = f"SELECT house_id, event_timestamp, {', '.join(field.name for field in house_schema)} FROM house_features_sql",
+    timestamp_field="event_timestamp",
+    tags={"table": "house_features_sql"}  # Read by the historical feature cache to version the source
 )
 
 house_features = FeatureView(
     name = "house_features",
     entities= [house],
     ttl=timedelta(days=10),
+    schema=house_schema,
+    online=True,  # Indicates that the feature view is accessible in the online store
+    source= pg_source,  # We'll load data programmatically
+)
+
+# Serving feedback pushed straight to the online store; the batch source is the offline copy kept by FeedbackPushWriter
+feedback_source = PostgreSQLSource(
+    name = "house_feedback_sql",
+    query = "SELECT house_id, event_timestamp, area, bedrooms, mainroad, prediction FROM house_feedback_sql",
+    timestamp_field="event_timestamp",
+    tags={"table": "house_feedback_sql"}
+)
+
+feedback_push_source = PushSource(
+    name = "house_feedback_push",
+    batch_source=feedback_source
+)
+
+house_feedback = FeatureView(
+    name = "house_feedback",
+    entities= [house],
+    ttl=timedelta(days=10),
     schema=[
         Field(name="area", dtype=Float32),
         Field(name="bedrooms", dtype=Float32),
-        Field(name="bathrooms", dtype=Float32),
-        Field(name="stories", dtype=Float32),
         Field(name="mainroad", dtype=Int64),
-        Field(name="guestroom", dtype=Int64),
-        Field(name="basement", dtype=Int64),
-        Field(name="hotwaterheating", dtype=Int64),
-        Field(name="airconditioning", dtype=Int64),
-        Field(name="parking", dtype=Float32),
-        Field(name="prefarea", dtype=Int64),
-        Field(name="furnishingstatus", dtype=Int64),
+        Field(name="prediction", dtype=Float32),
     ],
-    online=True,  # Indicates that the feature view is accessible in the online store
-    source= pg_source,  # We'll load data programmatically
+    online=True,
+    source= feedback_push_source,
 )
-
@@ -1,25 +1,116 @@
 import os
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import sqlalchemy as db
 from feast import FeatureStore
 from feast.infra.offline_stores.file_source import SavedDatasetFileStorage
 from datetime import datetime
 
+from feature_store.pit_join import LocalPointInTimeJoin
+from feature_store.historical_cache import HistoricalFeatureCache
+from feature_store.entity_loader import ParquetEntityLoader
+from feature_store.source_query import source_table, table_version
+
 class FeastFeatureStore:
     def __init__(self, path: str):
         self.store = FeatureStore(repo_path=path)
         self.retrieval_job = None 
+        self.historical_cache = None
+        self.source_check = "version"
+        if os.getenv("HISTORICAL_FEATURE_CACHE_DIR"):
+            self.enable_historical_cache(
+                os.getenv("HISTORICAL_FEATURE_CACHE_DIR"),
+                max_bytes=int(os.getenv("HISTORICAL_FEATURE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+            )
 
-    def get_entity_dataframe(self, path: str) -> pd.DataFrame:
-        entity_df = pd.read_parquet(path)
+    def get_entity_dataframe(self, path: str, columns: list = None, start: datetime = None, end: datetime = None,
+                             filters: list = None, memory_map: bool = True) -> pd.DataFrame:
+        # Projection and timestamp / filter predicates are applied while reading, skipping row groups by their statistics
+        loader = ParquetEntityLoader(path, columns=columns, start=start, end=end, filters=filters, memory_map=memory_map)
+        entity_df = loader.read()
         return entity_df
+
+    def iter_entity_batches(self, path: str, columns: list = None, start: datetime = None, end: datetime = None,
+                            filters: list = None, batch_size: int = 100_000):
+        # Streams the entity frame from a memory-mapped file for entity sets larger than RAM
+        loader = ParquetEntityLoader(path, columns=columns, start=start, end=end, filters=filters, batch_size=batch_size)
+        yield from loader.iter_batches()
     
-    def get_historical_features(self, entity_df: pd.DataFrame, features: list) -> pd.DataFrame:
+    def enable_historical_cache(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024, source_check: str = "version"):
+        # source_check "version" reads the table's relfilenode and the version row the loaders bump (no data scan),
+        # "checksum" hashes every source row and also catches writes made outside the loaders
+        if source_check not in ("version", "checksum"):
+            raise ValueError(f"Unsupported source_check {source_check}, expected version or checksum")
+        self.historical_cache = HistoricalFeatureCache(cache_dir, max_bytes)
+        self.source_check = source_check
+        return self.historical_cache
+
+    def source_version(self, source) -> str:
+        with self.offline_engine().connect() as connection:
+            if self.source_check == "checksum":
+                query = (f"SELECT COUNT(*), MAX({source.timestamp_field}), SUM(hashtext(src::text)) "
+                         f"FROM {source.get_table_query_string()} AS src")
+                row = connection.execute(db.text(query)).one()
+            else:
+                row = table_version(connection, source_table(source))
+        return str(tuple(row) if row is not None else None)
+
+    def historical_cache_key(self, entity_df: pd.DataFrame, features: list, engine: str = "feast") -> str:
+        feature_views = [self.store.get_feature_view(name) for name in sorted({ref.split(":")[0] for ref in features})]
+        # Only the spec is hashed, so materialization updates to the FeatureView metadata keep the cache valid
+        view_versions = {fv.name: hashlib.sha256(fv.to_proto().spec.SerializeToString()).hexdigest() for fv in feature_views}
+        source_versions = {fv.batch_source.name: self.source_version(fv.batch_source) for fv in feature_views}
+        # Each engine's output is cached apart, so comparing engines never compares a cached copy with itself
+        return self.historical_cache.key(entity_df, features, view_versions, source_versions, engine)
+
+    def get_historical_features(self, entity_df: pd.DataFrame, features: list, engine: str = "feast") -> pd.DataFrame:
+        if self.historical_cache is None:
+            return self.retrieve_historical_features(entity_df, features, engine)
+
+        key = self.historical_cache_key(entity_df, features, engine)
+        historical_df = self.historical_cache.get(key)
+        if historical_df is not None:
+            print(f"Historical features served from cache {self.historical_cache.path(key)}")
+            return historical_df
+
+        historical_df = self.retrieve_historical_features(entity_df, features, engine)
+        self.historical_cache.put(key, historical_df)
+        return historical_df
+
+    def retrieve_historical_features(self, entity_df: pd.DataFrame, features: list, engine: str = "feast") -> pd.DataFrame:
+        # engine="local" runs the point-in-time join in-process instead of in the offline store
+        if engine == "local":
+            return self.get_local_historical_features(entity_df, features)
+
         self.retrieval_job = self.store.get_historical_features(
             entity_df=entity_df,
             features=features
         )
 
         return self.retrieval_job.to_df()
+
+    def offline_engine(self) -> db.Engine:
+        # Pooled in the process-wide registry, so resources.close() and health_check() cover it. Imported here
+        # because the registry builds FeastFeatureStore instances; not cached, so a closed registry hands out a new pool
+        from feature_store.resource_registry import resources
+
+        config = self.store.config.offline_store
+        url = db.engine.URL.create(
+            "postgresql+psycopg",
+            username=config.user,
+            password=config.password,
+            host=config.host,
+            port=int(config.port),
+            database=config.database
+        )
+        return resources.get_engine(url.render_as_string(hide_password=False))
+
+    def get_local_historical_features(self, entity_df: pd.DataFrame, features: list) -> pd.DataFrame:
+        view_names = {ref.split(":")[0] for ref in features}
+        feature_views = {name: self.store.get_feature_view(name) for name in view_names}
+        return LocalPointInTimeJoin(self.offline_engine()).get_historical_features(entity_df, features, feature_views)
     
     def save_dataset(self, file_name: str, path: str):
         self.store.create_saved_dataset(
@@ -29,15 +120,17 @@ class FeastFeatureStore:
         )
         print(str.format("File {0} saved successfully", file_name))
 
-    def materialize(self, end_date, start_date=None, incremental: bool=False):
+    def materialize(self, end_date, start_date=None, incremental: bool=False, feature_views: list=None):
         if not incremental:
             self.store.materialize(
                 end_date=end_date,
-                start_date=start_date
+                start_date=start_date,
+                feature_views=feature_views
             )
         else:
             self.store.materialize_incremental(
-                end_date=end_date
+                end_date=end_date,
+                feature_views=feature_views
             )
 
     def get_online_features(self, features: list, entity_rows: list) -> pd.DataFrame:
@@ -45,4 +138,31 @@ class FeastFeatureStore:
             features=features,
             entity_rows=entity_rows
         )
-        return retrieval_job.to_df()
\ No newline at end of file
+        return retrieval_job.to_df()
+
+    def iter_online_features(self, features: list, entity_df: pd.DataFrame, chunk_size: int = 1000, max_workers: int = 4):
+        # Yields one frame per chunk of entity keys, in key order, with at most max_workers chunks in flight
+        columns = {name: entity_df[name].tolist() for name in entity_df.columns}
+        n_rows = len(entity_df)
+
+        def fetch(start: int) -> pd.DataFrame:
+            entity_rows = [
+                dict(zip(columns, values))
+                for values in zip(*(col[start:start + chunk_size] for col in columns.values()))
+            ]
+            return self.get_online_features(features=features, entity_rows=entity_rows)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for start in range(0, n_rows, chunk_size):
+                pending.append(executor.submit(fetch, start))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def get_online_features_chunked(self, features: list, entity_df: pd.DataFrame, chunk_size: int = 1000, max_workers: int = 4) -> pd.DataFrame:
+        chunks = list(self.iter_online_features(features, entity_df, chunk_size, max_workers))
+        if not chunks:
+            return self.get_online_features(features=features, entity_rows=[])
+        return pd.concat(chunks, ignore_index=True)
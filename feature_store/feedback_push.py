@@ -0,0 +1,90 @@
+import time
+import random
+
+import pandas as pd
+from feast.data_source import PushMode
+
+from feature_store.bulk_loader import PostgresBulkLoader
+
+PUSH_COLUMNS = ["event_timestamp", "house_id", "area", "bedrooms", "mainroad", "prediction"]
+PUSH_KEYS = ["house_id", "event_timestamp"]
+# pandas dtype for each Feast value type; Feast's proto conversion asserts the scalar type of INT64 values
+VALUE_TYPE_DTYPES = {"INT32": "int32", "INT64": "int64", "FLOAT": "float32", "DOUBLE": "float64", "BOOL": "bool", "STRING": "string"}
+
+
+# FeedbackSink writer that pushes serving feedback through the house_feedback PushSource. Rows land in
+# the online store through Feast and in the offline table through a keyed upsert, so a retried batch
+# overwrites itself instead of duplicating rows.
+class FeedbackPushWriter:
+    def __init__(self, fstore, push_source_name: str = "house_feedback_push", table: str = "house_feedback_sql",
+                 max_batch_rows: int = 1000, max_retries: int = 3, backoff: float = 0.5, offline: bool = True,
+                 feature_view: str = "house_feedback"):
+        self.fstore = fstore
+        self.push_source_name = push_source_name
+        self.feature_view = feature_view
+        self._dtypes = None
+        self.table = table
+        self.max_batch_rows = max_batch_rows
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.offline = offline
+
+    def _retry(self, action, description: str):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return action()
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                print(f"{description} failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def to_frame(rows) -> pd.DataFrame:
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=PUSH_COLUMNS)
+        df = df.assign(event_timestamp=pd.to_datetime(df["event_timestamp"], utc=True))
+        # (house_id, event_timestamp) is the idempotency key; the last record for a key wins
+        return df.drop_duplicates(subset=PUSH_KEYS, keep="last").reset_index(drop=True)
+
+    def dtypes(self) -> dict:
+        if self._dtypes is None:
+            fv = self.fstore.store.get_feature_view(self.feature_view)
+            self._dtypes = {
+                field.name: VALUE_TYPE_DTYPES[field.dtype.to_value_type().name]
+                for field in fv.entity_columns + fv.features
+                if field.dtype.to_value_type().name in VALUE_TYPE_DTYPES
+            }
+        return self._dtypes
+
+    def cast(self, df: pd.DataFrame, floats: bool = True) -> pd.DataFrame:
+        # Serving hands over every feature as float64; cast to the FeatureView schema so e.g. Int64 mainroad
+        # reaches Feast as integers. floats=False keeps float64 precision for the offline copy.
+        dtypes = {
+            name: dtype for name, dtype in self.dtypes().items()
+            if name in df.columns and (floats or not dtype.startswith("float"))
+        }
+        return df.astype(dtypes)
+
+    def push(self, df: pd.DataFrame) -> int:
+        df = self.cast(self.to_frame(df), floats=False)
+        for start in range(0, len(df), self.max_batch_rows):
+            chunk = df.iloc[start:start + self.max_batch_rows]
+            online_chunk = self.cast(chunk)
+            self._retry(
+                lambda: self.fstore.store.push(self.push_source_name, online_chunk, to=PushMode.ONLINE),
+                f"Online push of {len(chunk)} feedback rows"
+            )
+            if self.offline:
+                loader = PostgresBulkLoader(self.fstore.offline_engine())
+                self._retry(
+                    lambda: loader.load(chunk, self.table, mode="upsert", key_columns=tuple(PUSH_KEYS), analyze=False),
+                    f"Offline upsert of {len(chunk)} feedback rows"
+                )
+        return len(df)
+
+    def write(self, rows: list):
+        self.push(rows)
+
+    def close(self):
+        pass
@@ -0,0 +1,72 @@
+import os
+import json
+import hashlib
+
+import pandas as pd
+
+
+# Content-addressed Parquet cache for get_historical_features results. The key covers the entity
+# frame content, the feature references, the FeatureView definitions and a version of each source.
+class HistoricalFeatureCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def fingerprint_frame(df: pd.DataFrame) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def key(self, entity_df: pd.DataFrame, features: list, view_versions: dict, source_versions: dict,
+            engine: str = "feast") -> str:
+        payload = {
+            "entity_df": self.fingerprint_frame(entity_df),
+            "features": list(features),
+            "engine": engine,
+            "views": view_versions,
+            "sources": source_versions,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key: str) -> pd.DataFrame:
+        path = self.path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        # mtime doubles as last access time for eviction
+        os.utime(path)
+        self.hits += 1
+        return pd.read_parquet(path)
+
+    def put(self, key: str, df: pd.DataFrame) -> str:
+        path = self.path(key)
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        self.evict()
+        return path
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".parquet"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+            print(f"Evicted cached historical features {name}")
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".parquet"):
+                os.remove(os.path.join(self.cache_dir, name))
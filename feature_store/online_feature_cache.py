@@ -0,0 +1,101 @@
+import time
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from feature_store.feature_store import FeastFeatureStore
+
+
+# Size-bounded LRU with a per-entry TTL, shared by every request thread
+class OnlineFeatureCache:
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get_many(self, keys: list) -> tuple:
+        found, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[1]
+                    self.hits += 1
+                    continue
+                if entry is not None:
+                    del self._entries[key]
+                    self.expirations += 1
+                missing.append(key)
+                self.misses += 1
+        return found, missing
+
+    def put_many(self, values: dict):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedOnlineFeatures:
+    def __init__(self, fstore: FeastFeatureStore, features: list, cache: OnlineFeatureCache, join_key: str = "house_id",
+                 replica=None):
+        self.fstore = fstore
+        # Optional SQLiteOnlineReplica read before the online store
+        self.features = features
+        self.cache = cache
+        self.join_key = join_key
+        self.replica = replica
+        self.columns = [feature.split(":")[-1] for feature in features]
+
+    def get(self, keys: list) -> pd.DataFrame:
+        found, missing = self.cache.get_many(keys)
+        if missing and self.replica is not None:
+            replicated, missing = self.replica.get_many(missing)
+            self.cache.put_many(replicated)
+            found.update(replicated)
+        if missing:
+            unique_missing = list(dict.fromkeys(missing))
+            online_df = self.fstore.get_online_features(
+                features=self.features,
+                entity_rows=[{self.join_key: key} for key in unique_missing]
+            )
+            fetched = {
+                key: row
+                for key, row in zip(unique_missing, online_df[self.columns].itertuples(index=False, name=None))
+                # Keys unknown to the online store come back as all nulls and are not cached
+                if not all(pd.isna(value) for value in row)
+            }
+            self.cache.put_many(fetched)
+            found.update(fetched)
+
+        empty = tuple([None] * len(self.columns))
+        features_df = pd.DataFrame([found.get(key, empty) for key in keys], columns=self.columns)
+        features_df.insert(0, self.join_key, keys)
+        return features_df
@@ -0,0 +1,130 @@
+import os
+import time
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from feature_store.source_query import pushdown_query, quote_identifier
+
+TABLE = "features"
+META_TABLE = "replica_meta"
+MAX_PARAMS = 500
+
+
+# Embedded read replica of one FeatureView's online rows, keyed by the join key. A refresh builds a new
+# SQLite file next to the old one and swaps it in with os.replace, so readers in the serving process
+# never see a half-written replica; each reader thread reopens its read-only, memory-mapped connection
+# once the file has been replaced. Lookups report every key as missing once the replica is older than
+# max_staleness_seconds, so callers fall back to the online store.
+class SQLiteOnlineReplica:
+    def __init__(self, path: str, columns: list, join_key: str = "house_id", max_staleness_seconds: float = 3600.0,
+                 mmap_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.columns = columns
+        self.join_key = join_key
+        self.max_staleness_seconds = max_staleness_seconds
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.stale_reads = 0
+
+    def _connection(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if getattr(self._local, "signature", None) != signature:
+            if getattr(self._local, "connection", None) is not None:
+                self._local.connection.close()
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+            connection.execute(f"PRAGMA mmap_size = {int(self.mmap_bytes)}")
+            meta = dict(connection.execute(f"SELECT key, value FROM {META_TABLE}").fetchall())
+            self._local.connection = connection
+            self._local.signature = signature
+            self._local.refreshed_at = float(meta["refreshed_at"])
+        return self._local.connection
+
+    def age_seconds(self) -> float:
+        if self._connection() is None:
+            return float("inf")
+        return time.time() - self._local.refreshed_at
+
+    def get_many(self, keys: list) -> tuple:
+        connection = self._connection()
+        if connection is None or time.time() - self._local.refreshed_at > self.max_staleness_seconds:
+            with self._lock:
+                self.stale_reads += 1
+                self.misses += len(keys)
+            return {}, list(keys)
+
+        unique_keys = list(dict.fromkeys(keys))
+        select = ", ".join(quote_identifier(c) for c in [self.join_key] + self.columns)
+        found = {}
+        for start in range(0, len(unique_keys), MAX_PARAMS):
+            chunk = unique_keys[start:start + MAX_PARAMS]
+            query = f"SELECT {select} FROM {TABLE} WHERE {quote_identifier(self.join_key)} IN ({', '.join('?' * len(chunk))})"
+            for row in connection.execute(query, chunk):
+                found[row[0]] = tuple(row[1:])
+        missing = [key for key in keys if key not in found]
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        return found, missing
+
+    def refresh(self, df: pd.DataFrame, timestamp_field: str = "event_timestamp") -> int:
+        # df holds the latest row per key, i.e. what materialization wrote to the online store
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        frame = df[[self.join_key, timestamp_field] + self.columns].copy()
+        frame[timestamp_field] = pd.to_datetime(frame[timestamp_field], utc=True).astype(str)
+        connection = sqlite3.connect(tmp_path)
+        try:
+            frame.to_sql(TABLE, connection, index=False)
+            connection.execute(f"CREATE UNIQUE INDEX {TABLE}_{self.join_key}_idx ON {TABLE} ({quote_identifier(self.join_key)})")
+            connection.execute(f"CREATE TABLE {META_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+            connection.executemany(
+                f"INSERT INTO {META_TABLE} VALUES (?, ?)",
+                [("refreshed_at", str(time.time())), ("rows", str(len(frame))), ("columns", ",".join(self.columns))]
+            )
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, self.path)
+        print(f"Refreshed online replica {self.path} with {len(frame)} rows")
+        return len(frame)
+
+    def refresh_from_source(self, fstore, feature_view, end_date: datetime = None) -> int:
+        # Same rows materialize() loads into the online store: the latest row per key within the ttl before end_date
+        source = feature_view.batch_source
+        join_keys = [column.name for column in feature_view.entity_columns]
+        sort_columns = [source.timestamp_field]
+        if source.created_timestamp_column:
+            sort_columns.append(source.created_timestamp_column)
+        end_date = end_date or datetime.now()
+        ttl = feature_view.ttl if feature_view.ttl and feature_view.ttl.total_seconds() > 0 else None
+
+        query, params = pushdown_query(
+            source, join_keys + sort_columns + self.columns, start=end_date - ttl if ttl is not None else None, end=end_date
+        )
+        df = pd.read_sql(query, fstore.offline_engine(), params=params)
+        latest = df.sort_values(sort_columns, kind="stable").drop_duplicates(subset=join_keys, keep="last")
+        return self.refresh(latest, timestamp_field=source.timestamp_field)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "age_seconds": self.age_seconds(),
+                "max_staleness_seconds": self.max_staleness_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_reads": self.stale_reads,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import sqlalchemy as db
+
+from feature_store.source_query import pushdown_query
+
+ROW_ID = "__entity_row"
+FEATURE_TS = "__feature_ts"
+
+
+# Local alternative to the Postgres offline store join: pulls each FeatureView source in chunks
+# and runs a sorted as-of join against the entity frame, honouring the FeatureView ttl
+class LocalPointInTimeJoin:
+    def __init__(self, engine: db.Engine, chunk_size: int = 100_000):
+        self.engine = engine
+        self.chunk_size = chunk_size
+
+    def read_source(self, feature_view, columns: list, start=None, end=None) -> pd.DataFrame:
+        # Only the requested columns and the timestamp range the entities can reach are read
+        query, params = pushdown_query(feature_view.batch_source, columns, start, end)
+        chunks = list(pd.read_sql(query, self.engine, params=params, chunksize=self.chunk_size))
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _join_view(self, entities: pd.DataFrame, feature_view, feature_names: list, output_names: list) -> pd.DataFrame:
+        source = feature_view.batch_source
+        join_keys = [column.name for column in feature_view.entity_columns]
+        sort_columns = [source.timestamp_field]
+        if source.created_timestamp_column:
+            sort_columns.append(source.created_timestamp_column)
+
+        ttl = feature_view.ttl if feature_view.ttl and feature_view.ttl.total_seconds() > 0 else None
+        min_ts, max_ts = entities["event_timestamp"].min(), entities["event_timestamp"].max()
+        start = time.perf_counter()
+        features = self.read_source(
+            feature_view,
+            join_keys + sort_columns + feature_names,
+            start=(min_ts - ttl).to_pydatetime() if ttl is not None else None,
+            end=max_ts.to_pydatetime()
+        )
+        print(f"Read {len(features)} rows from {source.name} in {time.perf_counter() - start:.2f}s")
+
+        features = features.rename(columns={source.timestamp_field: FEATURE_TS, **dict(zip(feature_names, output_names))})
+        features[FEATURE_TS] = pd.to_datetime(features[FEATURE_TS], utc=True)
+        # Ties on the event timestamp resolve to the latest created row, as in Feast
+        features = features.sort_values([FEATURE_TS] + sort_columns[1:], kind="stable")
+        features = features.drop(columns=sort_columns[1:])
+        for key in join_keys:
+            features[key] = features[key].astype(entities[key].dtype)
+
+        joined = pd.merge_asof(
+            entities[[ROW_ID, "event_timestamp"] + join_keys],
+            features,
+            left_on="event_timestamp",
+            right_on=FEATURE_TS,
+            by=join_keys,
+            direction="backward",
+            tolerance=pd.Timedelta(ttl) if ttl is not None else None,
+            allow_exact_matches=True
+        )
+        return joined.set_index(ROW_ID)[output_names]
+
+    def get_historical_features(self, entity_df: pd.DataFrame, features: list, feature_views: dict,
+                                full_feature_names: bool = False) -> pd.DataFrame:
+        refs = OrderedDict()
+        for ref in features:
+            view_name, feature_name = ref.split(":")
+            refs.setdefault(view_name, []).append(feature_name)
+
+        result = entity_df.copy()
+        result["event_timestamp"] = pd.to_datetime(result["event_timestamp"], utc=True)
+        result[ROW_ID] = range(len(result))
+        entities = result.sort_values("event_timestamp", kind="stable")
+
+        for view_name, feature_names in refs.items():
+            output_names = [f"{view_name}__{name}" if full_feature_names else name for name in feature_names]
+            joined = self._join_view(entities, feature_views[view_name], feature_names, output_names)
+            result = result.join(joined, on=ROW_ID)
+
+        return result.drop(columns=[ROW_ID])
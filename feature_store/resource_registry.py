@@ -0,0 +1,81 @@
+import os
+import threading
+
+import sqlalchemy as db
+
+from feature_store.feature_store import FeastFeatureStore
+
+
+# Process-wide pool of FeatureStore and SQLAlchemy engine instances, so repeated pipeline
+# steps reuse the loaded registry and warm database connections
+class ResourceRegistry:
+    def __init__(self, pool_size: int = 5, max_overflow: int = 5, pool_recycle: int = 1800):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self._lock = threading.RLock()
+        self._feature_stores = {}
+        self._engines = {}
+        self._applied = {}
+
+    def get_feature_store(self, repo_path: str) -> FeastFeatureStore:
+        key = os.path.abspath(repo_path)
+        with self._lock:
+            if key not in self._feature_stores:
+                self._feature_stores[key] = FeastFeatureStore(key)
+            return self._feature_stores[key]
+
+    def apply_once(self, fstore: FeastFeatureStore, objects: list):
+        # store.apply rewrites the registry; skip it when these definitions were already applied by this process
+        names = frozenset(obj.name for obj in objects)
+        with self._lock:
+            applied = self._applied.setdefault(id(fstore), set())
+            if names <= applied:
+                return
+            fstore.store.apply(objects)
+            applied.update(names)
+
+    def get_engine(self, connstr: str) -> db.Engine:
+        with self._lock:
+            if connstr not in self._engines:
+                self._engines[connstr] = db.create_engine(
+                    connstr,
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow,
+                    pool_recycle=self.pool_recycle,
+                    pool_pre_ping=True
+                )
+            return self._engines[connstr]
+
+    def health_check(self) -> dict:
+        status = {}
+        with self._lock:
+            engines = dict(self._engines)
+            stores = dict(self._feature_stores)
+        for connstr, engine in engines.items():
+            name = engine.url.render_as_string(hide_password=True)
+            try:
+                with engine.connect() as connection:
+                    connection.execute(db.text("SELECT 1"))
+                status[name] = "ok"
+            except Exception as e:
+                status[name] = f"error: {e}"
+        for path, fstore in stores.items():
+            try:
+                fstore.store.refresh_registry()
+                status[path] = "ok"
+            except Exception as e:
+                status[path] = f"error: {e}"
+        return status
+
+    def close(self):
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._feature_stores.clear()
+            self._applied.clear()
+        print("Closed pooled feature stores and engines")
+
+
+resources = ResourceRegistry()
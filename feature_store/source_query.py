@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import sqlalchemy as db
+
+
+# One row per offline table, bumped by every loader write in the write's own transaction
+VERSION_TABLE = "feature_source_versions"
+CREATE_VERSION_TABLE = (
+    f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} "
+    f"(table_name text PRIMARY KEY, version bigint NOT NULL, updated_at timestamptz NOT NULL DEFAULT now())"
+)
+BUMP_VERSION = (
+    f"INSERT INTO {VERSION_TABLE} (table_name, version) VALUES (%(table)s, 1) "
+    f"ON CONFLICT (table_name) DO UPDATE SET version = {VERSION_TABLE}.version + 1, updated_at = now()"
+)
+
+
+def quote_identifier(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def source_table(source) -> str:
+    # Query sources name their table in the "table" tag; table sources carry it themselves
+    table = source.tags.get("table") or getattr(source.postgres_options, "_table", None)
+    if not table:
+        raise ValueError(f"Source {source.name} has no table; add tags={{'table': ...}} to its definition")
+    return table
+
+
+def bump_table_version(cursor, table: str):
+    # cursor is a DB-API cursor inside the transaction that changed the table
+    cursor.execute(CREATE_VERSION_TABLE)
+    cursor.execute(BUMP_VERSION, {"table": table})
+
+
+def table_version(connection, table: str) -> tuple:
+    # relfilenode changes whenever the table is dropped and recreated or truncated, even outside the loaders;
+    # the version row changes on every loader write. Neither needs a data scan.
+    relfilenode = connection.execute(
+        db.text("SELECT relfilenode FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    version = None
+    if connection.execute(db.text("SELECT to_regclass(:table)"), {"table": VERSION_TABLE}).scalar() is not None:
+        version = connection.execute(
+            db.text(f"SELECT version FROM {VERSION_TABLE} WHERE table_name = :table"), {"table": table}
+        ).scalar()
+    return relfilenode, version
+
+
+def pushdown_query(source, columns: list, start: datetime = None, end: datetime = None) -> tuple:
+    # Selects only the requested columns of a batch source, bounded to start <= timestamp <= end,
+    # so Postgres scans and ships just what the caller asked for
+    select = ", ".join(quote_identifier(c) for c in dict.fromkeys(columns))
+    query = f"SELECT {select} FROM {source.get_table_query_string()} AS src"
+
+    conditions, params = [], {}
+    if start is not None:
+        conditions.append(f"{quote_identifier(source.timestamp_field)} >= :start")
+        params["start"] = start
+    if end is not None:
+        conditions.append(f"{quote_identifier(source.timestamp_field)} <= :end")
+        params["end"] = end
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return db.text(query), params
@@ -0,0 +1,93 @@
+import numpy as np
+import mlflow
+from mlflow.models import Model
+from mlflow.pyfunc import PyFuncModel
+from sklearn.linear_model import (
+    LinearRegression, Ridge, RidgeCV, Lasso, LassoCV, ElasticNet, ElasticNetCV,
+    Lars, LassoLars, BayesianRidge, ARDRegression, HuberRegressor, SGDRegressor
+)
+
+# bentoml.mlflow keeps the imported MLflow model under this folder of the Bento model
+MLFLOW_MODEL_FOLDER = "mlflow_model"
+
+# Estimators whose predict() is exactly X @ coef_ + intercept_
+LINEAR_ESTIMATORS = (
+    LinearRegression, Ridge, RidgeCV, Lasso, LassoCV, ElasticNet, ElasticNetCV,
+    Lars, LassoLars, BayesianRidge, ARDRegression, HuberRegressor, SGDRegressor
+)
+
+
+class LinearScorer:
+    def __init__(self, coef, intercept, feature_names=None):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).reshape(-1)
+        self.intercept = float(np.asarray(intercept, dtype=np.float64).reshape(-1)[0])
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        if not isinstance(estimator, LINEAR_ESTIMATORS):
+            return None
+        coef = np.asarray(estimator.coef_)
+        # Multi-output models keep the sklearn path
+        if coef.ndim != 1 and coef.shape[0] != 1:
+            return None
+        return cls(coef, estimator.intercept_, getattr(estimator, "feature_names_in_", None))
+
+    @property
+    def n_features(self) -> int:
+        return self.coef.shape[0]
+
+    def predict(self, input_data) -> np.ndarray:
+        x = np.asarray(input_data, dtype=np.float64)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        return x @ self.coef + self.intercept
+
+
+def model_feature_names(model, default: list = None) -> list:
+    # Column order the model scores positional input by: sklearn estimators and LinearScorer record it,
+    # MLflow pyfunc models keep it in a named input signature or in the wrapped sklearn estimator
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        names = getattr(model, "feature_names", None)
+    if names is None and isinstance(model, PyFuncModel):
+        schema = model.metadata.get_input_schema()
+        if schema is not None and schema.has_input_names():
+            names = schema.input_names()
+        else:
+            try:
+                names = getattr(model.get_raw_model(), "feature_names_in_", None)
+            except Exception:
+                names = None
+    return list(names) if names is not None else default
+
+
+def load_sklearn_model(bento_model):
+    path = bento_model.path_of(MLFLOW_MODEL_FOLDER)
+    if "sklearn" not in Model.load(path).flavors:
+        return None
+    return mlflow.sklearn.load_model(path)
+
+
+def verify_parity(scorer: LinearScorer, model, n_rows: int = 64, rtol: float = 1e-9) -> bool:
+    sample = np.random.default_rng(0).normal(size=(n_rows, scorer.n_features))
+    try:
+        expected = np.asarray(model.predict(sample), dtype=np.float64).reshape(-1)
+    except Exception as e:
+        print(f"Fast path parity check could not run: {e}")
+        return False
+    actual = scorer.predict(sample)
+    return bool(np.allclose(actual, expected, rtol=rtol, atol=1e-6 * np.abs(expected).max()))
+
+
+def load_fast_path(bento_model, pyfunc_model):
+    # Returns a LinearScorer matching pyfunc_model, or None to keep serving through pyfunc
+    estimator = load_sklearn_model(bento_model)
+    scorer = LinearScorer.from_estimator(estimator) if estimator is not None else None
+    if scorer is None:
+        print(f"Fast path unavailable for {bento_model.tag}: not a linear sklearn model")
+        return None
+    if not verify_parity(scorer, pyfunc_model):
+        print(f"Fast path disabled for {bento_model.tag}: predictions differ from pyfunc")
+        return None
+    return scorer
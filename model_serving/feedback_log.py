@@ -0,0 +1,173 @@
+import os
+import glob
+import json
+import fcntl
+import uuid
+from datetime import datetime
+from itertools import groupby
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from model_serving.feedback_sink import FEEDBACK_COLUMNS
+
+FEEDBACK_SCHEMA = pa.schema([
+    ("event_timestamp", pa.timestamp("us")),
+    ("area", pa.float64()),
+    ("bedrooms", pa.float64()),
+    ("mainroad", pa.float64()),
+    ("prediction", pa.float64()),
+])
+MANIFEST_NAME = "_manifest.jsonl"
+
+
+def _hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+# Hourly partitioned Parquet segments: <root>/date=YYYY-MM-DD/hour=HH/part-*.parquet
+class ParquetFeedbackWriter:
+    def __init__(self, root: str, schema: pa.Schema = FEEDBACK_SCHEMA):
+        self.root = root
+        self.schema = schema
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    def _write_segment(self, hour: datetime, rows: list) -> dict:
+        partition = f"date={hour:%Y-%m-%d}/hour={hour:%H}"
+        os.makedirs(os.path.join(self.root, partition), exist_ok=True)
+        rel_path = f"{partition}/part-{os.getpid()}-{uuid.uuid4().hex}.parquet"
+        path = os.path.join(self.root, rel_path)
+
+        columns = list(zip(*rows))
+        table = pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, self.schema)],
+            schema=self.schema
+        )
+        # Segments are published only once complete
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+        timestamps = columns[0]
+        return {
+            "path": rel_path,
+            "partition": partition,
+            "min_ts": min(timestamps).isoformat(),
+            "max_ts": max(timestamps).isoformat(),
+            "rows": len(rows),
+        }
+
+    def _append_manifest(self, entries: list):
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+        # A single O_APPEND write keeps manifest lines whole across writers
+        fd = os.open(self.manifest_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def write(self, rows: list):
+        rows = sorted(rows, key=lambda row: row[0])
+        entries = [
+            self._write_segment(hour, list(hour_rows))
+            for hour, hour_rows in groupby(rows, key=lambda row: _hour(row[0]))
+        ]
+        self._append_manifest(entries)
+
+    def close(self):
+        pass
+
+
+class FeedbackLog:
+    def __init__(self, root: str, csv_path: str = None):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        # Optional CSV feedback (HOUSE_SERVICE_FEEDBACK_FORMAT=csv, or history from before the Parquet log),
+        # read together with its rotated feedback-<timestamp>.csv siblings
+        self.csv_path = csv_path
+
+    def segments(self, since: datetime = None) -> list:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path) as f:
+            # A line is only complete once its newline is written
+            entries = [json.loads(line) for line in f if line.endswith("\n") and line.strip()]
+        if since is not None:
+            entries = [e for e in entries if datetime.fromisoformat(e["max_ts"]) > since]
+        return entries
+
+    def csv_files(self) -> list:
+        if not self.csv_path:
+            return []
+        base, ext = os.path.splitext(self.csv_path)
+        paths = sorted(glob.glob(f"{glob.escape(base)}-*{ext}")) + [self.csv_path]
+        return [path for path in paths if os.path.exists(path) and os.path.getsize(path) > 0]
+
+    def _read_csv(self, path, columns: list = None) -> pd.DataFrame:
+        # path can be an open file
+        df = pd.read_csv(path, usecols=columns)
+        if "event_timestamp" in df.columns:
+            df["event_timestamp"] = pd.to_datetime(df["event_timestamp"], format="ISO8601")
+        return df.astype({c: "float64" for c in df.columns if c != "event_timestamp"})
+
+    def watermark(self) -> datetime:
+        timestamps = [datetime.fromisoformat(e["max_ts"]) for e in self.segments()]
+        for path in self.csv_files():
+            df = self._read_csv(path, ["event_timestamp"])
+            if len(df):
+                timestamps.append(df["event_timestamp"].max().to_pydatetime())
+        if not timestamps:
+            return None
+        return max(timestamps)
+
+    def read(self, since: datetime = None, columns: list = None) -> pd.DataFrame:
+        read_columns = None
+        if columns is not None:
+            read_columns = list(columns)
+            if since is not None and "event_timestamp" not in read_columns:
+                read_columns.append("event_timestamp")
+
+        frames = []
+        paths = [os.path.join(self.root, e["path"]) for e in self.segments(since)]
+        if paths:
+            frames.append(pq.read_table(paths, columns=read_columns, schema=FEEDBACK_SCHEMA).to_pandas())
+        frames.extend(self._read_csv(path, read_columns) for path in self.csv_files())
+        if not frames:
+            return pd.DataFrame(columns=columns or FEEDBACK_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True)
+        if since is not None:
+            df = df[df["event_timestamp"] > since]
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+    def read_after(self, position: dict = None, columns: list = None) -> tuple:
+        # Consumption tracked by log position, not event time: segments are published late (every worker
+        # flushes on its own interval), so a segment can land after a reader with rows older than anything it
+        # has seen. position holds the number of manifest entries consumed and the rows consumed per CSV file,
+        # keyed by inode so a rotated file keeps its count. Returns the new rows and the position after them.
+        position = position or {"segments": 0, "csv": {}}
+        entries = self.segments()
+        frames = []
+        paths = [os.path.join(self.root, e["path"]) for e in entries[position["segments"]:]]
+        if paths:
+            frames.append(pq.read_table(paths, columns=columns, schema=FEEDBACK_SCHEMA).to_pandas())
+
+        csv_rows = {}
+        if self.csv_path:
+            # Shared hold on the CSVFeedbackWriter lock: no half-written rows, no rotation mid-read
+            with open(self.csv_path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_SH)
+                for path in self.csv_files():
+                    with open(path) as f:
+                        inode = str(os.fstat(f.fileno()).st_ino)
+                        df = self._read_csv(f, columns)
+                    frames.append(df.iloc[position["csv"].get(inode, 0):])
+                    csv_rows[inode] = len(df)
+
+        new_position = {"segments": len(entries), "csv": csv_rows}
+        if not frames:
+            return pd.DataFrame(columns=columns or FEEDBACK_COLUMNS), new_position
+        return pd.concat(frames, ignore_index=True), new_position
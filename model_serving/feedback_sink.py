@@ -0,0 +1,137 @@
+import io
+import os
+import csv
+import time
+import fcntl
+import queue
+import threading
+from datetime import datetime
+
+FEEDBACK_COLUMNS = ["event_timestamp", "area", "bedrooms", "mainroad", "prediction"]
+
+
+def feedback_rows(timestamp: datetime, feature_columns: list, input_data, pred, columns: list = FEEDBACK_COLUMNS) -> list:
+    # Inputs arrive in the model's column order; each row is keyed by name and written in the log's order
+    features = columns[1:-1]
+    rows = []
+    for row, value in zip(input_data.tolist(), pred.tolist()):
+        record = dict(zip(feature_columns, row))
+        rows.append([timestamp, *(record[name] for name in features), value])
+    return rows
+
+
+# Safe to share between worker processes: each flush holds an exclusive lock on <path>.lock
+# and lands as a single append, so rows never interleave and rotation never loses a batch.
+class CSVFeedbackWriter:
+    def __init__(self, path: str, columns: list = FEEDBACK_COLUMNS, max_bytes: int = 64 * 1024 * 1024, truncate: bool = False):
+        self.path = path
+        self.columns = columns
+        self.max_bytes = max_bytes
+        self.lock_path = path + ".lock"
+        if truncate:
+            with self._locked():
+                open(self.path, "w").close()
+
+    def _locked(self):
+        lock_file = open(self.lock_path, "w")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def rotate(self):
+        base, ext = os.path.splitext(self.path)
+        os.replace(self.path, f"{base}-{datetime.now():%Y%m%d%H%M%S%f}{ext}")
+
+    def write(self, rows: list):
+        buffer = io.StringIO(newline='')
+        csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+
+        with self._locked():
+            with open(self.path, "a", newline='') as file:
+                if file.tell() == 0:
+                    csv.DictWriter(file, fieldnames=self.columns).writeheader()
+                file.write(buffer.getvalue())
+                size = file.tell()
+            if self.max_bytes and size >= self.max_bytes:
+                self.rotate()
+
+    def close(self):
+        pass
+
+
+class FeedbackSink:
+    _STOP = object()
+
+    def __init__(self, writer, max_queue_size: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 1.0, block_timeout: float = 0.0):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # 0 drops immediately when the queue is full, > 0 applies backpressure for that long
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self.counters = {"enqueued": 0, "written": 0, "dropped": 0, "flushes": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="feedback-sink", daemon=True)
+        self._thread.start()
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def submit(self, rows: list) -> int:
+        accepted = 0
+        for row in rows:
+            try:
+                if self.block_timeout > 0:
+                    self._queue.put(row, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(row)
+                accepted += 1
+            except queue.Full:
+                self._count("dropped", len(rows) - accepted)
+                break
+        self._count("enqueued", accepted)
+        return accepted
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _flush(self, batch: list):
+        if not batch:
+            return
+        try:
+            self.writer.write(batch)
+            self._count("written", len(batch))
+            self._count("flushes")
+        except Exception as e:
+            self._count("errors")
+            print(f"Feedback flush failed, {len(batch)} rows lost: {e}")
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def close(self, timeout: float = 10.0):
+        if not self._thread.is_alive():
+            return
+        # Sentinel goes behind every queued row so the final flush drains them all
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=timeout)
+        self.writer.close()
+        print(f"Feedback sink closed: {self.counters}")
@@ -0,0 +1,43 @@
+import bentoml
+
+# Prometheus metrics exported on the service /metrics path.
+# Stage timings go down to 10us so the NumPy fast path is still visible.
+STAGE_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+STAGE_DURATION = bentoml.metrics.Histogram(
+    name="house_service_stage_duration_seconds",
+    documentation="Time spent in each stage of HouseService.predict",
+    labelnames=["stage"],
+    buckets=STAGE_BUCKETS
+)
+BATCH_SIZE = bentoml.metrics.Histogram(
+    name="house_service_batch_size",
+    documentation="Rows scored per model.predict call",
+    buckets=BATCH_SIZE_BUCKETS
+)
+FEEDBACK_QUEUE_DEPTH = bentoml.metrics.Gauge(
+    name="house_service_feedback_queue_depth",
+    documentation="Feedback rows waiting for the background writer"
+)
+FEEDBACK_DROPPED = bentoml.metrics.Counter(
+    name="house_service_feedback_dropped_total",
+    documentation="Feedback rows dropped because the queue was full"
+)
+MODEL_VERSION = bentoml.metrics.Gauge(
+    name="house_service_model_version",
+    documentation="1 for the model version currently serving, 0 for replaced versions",
+    labelnames=["model", "version"]
+)
+TIME_TO_READY = bentoml.metrics.Gauge(
+    name="house_service_time_to_ready_seconds",
+    documentation="Seconds from worker start until the model is loaded and warmed up",
+    labelnames=["source"]
+)
+
+
+def set_model_version(tag, serving: bool = True):
+    MODEL_VERSION.labels(model=tag.name, version=tag.version).set(1 if serving else 0)
@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import tempfile
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+
+from model_serving.fast_path import MLFLOW_MODEL_FOLDER, LinearScorer, load_sklearn_model, verify_parity
+
+CACHE_FORMAT = 2
+
+
+# Local copy of a Bento model that skips the store lookup and MLflow flavor loading on restart.
+# Arrays are memory-mapped read-only, so every worker on the node shares one copy through the page cache.
+class ModelCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_dir(self, bento_model) -> str:
+        return os.path.join(self.cache_dir, bento_model.tag.name, bento_model.tag.version)
+
+    @contextmanager
+    def lock(self, bento_model):
+        # Serializes materialization across worker processes; the first worker fills the cache, the rest reuse it
+        lock_path = self.entry_dir(bento_model) + ".lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def fingerprint(self, bento_model) -> str:
+        digest = hashlib.sha256()
+        root = bento_model.path_of(MLFLOW_MODEL_FOLDER)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self, bento_model, fast_path: bool = False):
+        entry = self.entry_dir(bento_model)
+        meta_path = os.path.join(entry, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if (meta.get("format") != CACHE_FORMAT or meta["tag"] != str(bento_model.tag)
+                or meta["hash"] != self.fingerprint(bento_model)):
+            print(f"Model cache entry for {bento_model.tag} is stale")
+            return None
+
+        if fast_path and meta["linear"]:
+            coef = np.load(os.path.join(entry, "coef.npy"), mmap_mode="r")
+            return LinearScorer(coef, meta["intercept"], meta["feature_names"])
+        return joblib.load(os.path.join(entry, "model.joblib"), mmap_mode="r")
+
+    def store(self, bento_model, pyfunc_model):
+        estimator = load_sklearn_model(bento_model)
+        if estimator is None:
+            print(f"Model cache skipped for {bento_model.tag}: not an sklearn model")
+            return None
+        scorer = LinearScorer.from_estimator(estimator)
+        linear = scorer is not None and verify_parity(scorer, pyfunc_model)
+
+        meta = {
+            "format": CACHE_FORMAT,
+            "tag": str(bento_model.tag),
+            "hash": self.fingerprint(bento_model),
+            "linear": linear,
+            "intercept": scorer.intercept if linear else None,
+            "feature_names": scorer.feature_names if linear else None,
+            "created_at": time.time(),
+        }
+        entry = self.entry_dir(bento_model)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry))
+        # Uncompressed joblib keeps numpy arrays as raw buffers that can be memory-mapped
+        joblib.dump(estimator, os.path.join(tmp_dir, "model.joblib"))
+        if linear:
+            np.save(os.path.join(tmp_dir, "coef.npy"), scorer.coef)
+        # meta.json is written last, so an entry without it is never read
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_dir, entry)
+        print(f"Model {bento_model.tag} cached at {entry}")
+        return estimator
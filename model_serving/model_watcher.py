@@ -0,0 +1,61 @@
+import threading
+
+import bentoml
+
+
+# Polls the model store (or a registry pointer file holding a model tag) and hot swaps new versions
+class ModelWatcher:
+    def __init__(self, model_name: str, current_tag, load_model, validate, swap,
+                 poll_interval: float = 30.0, pointer_path: str = None):
+        self.model_name = model_name
+        self.current_tag = str(current_tag)
+        self.load_model = load_model
+        self.validate = validate
+        self.swap = swap
+        self.poll_interval = poll_interval
+        self.pointer_path = pointer_path
+        self.rejected_tags = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def latest_tag(self) -> str:
+        if self.pointer_path:
+            with open(self.pointer_path) as f:
+                return f.read().strip()
+        return str(bentoml.models.get(f"{self.model_name}:latest").tag)
+
+    def check_once(self) -> bool:
+        tag = self.latest_tag()
+        if tag == self.current_tag or tag in self.rejected_tags:
+            return False
+
+        print(f"New model version {tag} found, loading in background")
+        bento_model = bentoml.models.get(tag)
+        try:
+            model, _ = self.load_model(bento_model)
+            self.validate(model)
+        except Exception as e:
+            # Keep serving the current model and do not retry this version
+            self.rejected_tags.add(tag)
+            print(f"Model {tag} failed warm-up validation, keeping {self.current_tag}: {e}")
+            return False
+
+        self.swap(bento_model, model)
+        self.current_tag = tag
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_once()
+            except Exception as e:
+                print(f"Model watcher check failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.poll_interval)
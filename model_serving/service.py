@@ -1,12 +1,73 @@
+import os
+import time
+import threading
+from typing import TYPE_CHECKING
 import bentoml
+from bentoml.exceptions import NotFound
 import numpy as np
-import csv 
-from datetime import datetime 
-import pandas as pd 
-from itertools import starmap 
+from datetime import datetime, timezone
+
+from model_serving.feedback_sink import FeedbackSink, CSVFeedbackWriter, FEEDBACK_COLUMNS, feedback_rows
+from model_serving.feedback_log import ParquetFeedbackWriter
+from model_serving.fast_path import load_fast_path, model_feature_names
+from model_serving.model_cache import ModelCache
+from model_serving.model_watcher import ModelWatcher
+from model_serving.metrics import (
+    STAGE_DURATION, BATCH_SIZE, FEEDBACK_QUEUE_DEPTH, FEEDBACK_DROPPED, TIME_TO_READY, set_model_version
+)
+
+if TYPE_CHECKING:
+    from feature_store.online_feature_cache import CachedOnlineFeatures
+
+# Column order the model was trained on (train_model.py), used when the served model does not record its own.
+# house_id lookups build their input in the served model's order, which is re-derived on every hot swap.
+FEATURE_COLUMNS = ["bedrooms", "mainroad", "area"]
+
+# Adaptive batching: concurrent requests are coalesced into one model.predict call. MAX_LATENCY_MS is the
+# latency bound of a request, not a fill timeout: requests BentoML expects to miss it are rejected with a 503
+MAX_BATCH_SIZE = int(os.getenv("HOUSE_SERVICE_MAX_BATCH_SIZE", "64"))
+MAX_LATENCY_MS = int(os.getenv("HOUSE_SERVICE_MAX_LATENCY_MS", "500"))
+
+# Score linear sklearn models with a NumPy dot product instead of the MLflow pyfunc wrapper
+FAST_PATH = os.getenv("HOUSE_SERVICE_FAST_PATH", "false").lower() in ("1", "true", "yes")
+
+# Worker processes, an integer or "cpu_count"
+WORKERS = os.getenv("HOUSE_SERVICE_WORKERS", "1")
+WORKERS = int(WORKERS) if WORKERS.isdigit() else WORKERS
+
+# Startup: reuse a local model cache across restarts and warm the model up before readiness.
+# With several workers the cache is on by default so they all map one read-only model image.
+MODEL_CACHE_DIR = os.getenv("HOUSE_SERVICE_MODEL_CACHE", "" if WORKERS == 1 else ".model_cache")
+WARMUP = os.getenv("HOUSE_SERVICE_WARMUP", "true").lower() in ("1", "true", "yes")
+WORKER_START = time.monotonic()
+MODEL_WATCH_INTERVAL = float(os.getenv("HOUSE_SERVICE_MODEL_WATCH_INTERVAL", "30"))
+MODEL_POINTER_PATH = os.getenv("HOUSE_SERVICE_MODEL_POINTER", "")
+
+# Feedback rows are queued in memory and written by a background thread
+FEEDBACK_ENABLED = os.getenv("HOUSE_SERVICE_FEEDBACK", "true").lower() in ("1", "true", "yes")
+FEEDBACK_FORMAT = os.getenv("HOUSE_SERVICE_FEEDBACK_FORMAT", "parquet")
+FEEDBACK_PATH = os.getenv("HOUSE_SERVICE_FEEDBACK_PATH", "feedback" if FEEDBACK_FORMAT == "parquet" else "feedback.csv")
+FEEDBACK_QUEUE_SIZE = int(os.getenv("HOUSE_SERVICE_FEEDBACK_QUEUE_SIZE", "10000"))
+FEEDBACK_BATCH_SIZE = int(os.getenv("HOUSE_SERVICE_FEEDBACK_BATCH_SIZE", "4096"))
+FEEDBACK_FLUSH_INTERVAL = float(os.getenv("HOUSE_SERVICE_FEEDBACK_FLUSH_INTERVAL", "10.0"))
+FEEDBACK_MAX_BYTES = int(os.getenv("HOUSE_SERVICE_FEEDBACK_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# house_id lookups can also push their feedback through the house_feedback PushSource, flushed every few seconds
+FEEDBACK_PUSH = os.getenv("HOUSE_SERVICE_FEEDBACK_PUSH", "false").lower() in ("1", "true", "yes")
+FEEDBACK_PUSH_BATCH_SIZE = int(os.getenv("HOUSE_SERVICE_FEEDBACK_PUSH_BATCH_SIZE", "1000"))
+FEEDBACK_PUSH_INTERVAL = float(os.getenv("HOUSE_SERVICE_FEEDBACK_PUSH_INTERVAL", "1.0"))
+
+# house_id lookups read the Feast online store through an LRU cache whose TTL follows the FeatureView ttl
+FEAST_REPO_PATH = os.getenv("HOUSE_SERVICE_FEAST_REPO", os.path.join(os.getcwd(), "feature_store", "feature_repo"))
+FEATURE_CACHE_SIZE = int(os.getenv("HOUSE_SERVICE_FEATURE_CACHE_SIZE", "10000"))
+
+# Optional embedded SQLite replica of house_features, read after the LRU cache and before Postgres
+ONLINE_REPLICA_PATH = os.getenv("HOUSE_SERVICE_ONLINE_REPLICA", "")
+ONLINE_REPLICA_MAX_STALENESS = float(os.getenv("HOUSE_SERVICE_ONLINE_REPLICA_MAX_STALENESS", "3600"))
 
 @bentoml.service(
-    resources={"cpu": "2"}, 
+    resources={"cpu": "2"},
+    workers=WORKERS,
     traffic={"timeout": 10},
     logging={
     "access": {
@@ -26,28 +87,185 @@ class HouseService:
     bento_model = bentoml.models.get("house_price_model:latest")
 
     def __init__(self):
-        self.model = self.bento_model.load_model()
-        with open('feedback.csv', 'w', newline='') as file: 
-            fieldnames = ["event_timestamp", "area", "bedrooms", "mainroad", "prediction"] 
-            writer = csv.DictWriter(file, fieldnames = fieldnames) 
-            writer.writeheader() 
+        self.model_cache = ModelCache(MODEL_CACHE_DIR) if MODEL_CACHE_DIR else None
+        model, source = self.load_model(self.bento_model)
+        # The model and the column order its input follows, swapped together as one tuple
+        self.serving = (model, model_feature_names(model, FEATURE_COLUMNS))
+        if WARMUP:
+            self.warm_up(model)
+        time_to_ready = time.monotonic() - WORKER_START
+        TIME_TO_READY.labels(source=source).set(time_to_ready)
+        set_model_version(self.bento_model.tag)
+        print(f"Serving {self.bento_model.tag} with {type(model).__name__}, ready in {time_to_ready:.3f}s ({source})")
+        if FEEDBACK_FORMAT == "parquet":
+            feedback_writer = ParquetFeedbackWriter(FEEDBACK_PATH)
+        else:
+            feedback_writer = CSVFeedbackWriter(FEEDBACK_PATH, max_bytes=FEEDBACK_MAX_BYTES)
+        self.feedback = FeedbackSink(
+            feedback_writer,
+            max_queue_size=FEEDBACK_QUEUE_SIZE,
+            batch_size=FEEDBACK_BATCH_SIZE,
+            flush_interval=FEEDBACK_FLUSH_INTERVAL
+        )
+        # Feast, the feature repo and SQLAlchemy are imported on first use, off the predict-only cold start
+        self.feature_cache = None
+        self.online_replica = None
+        self._online_features = None
+        self._online_lock = threading.Lock()
+        self.feedback_push = None
+        if FEEDBACK_PUSH:
+            from feature_store.resource_registry import resources
+            from feature_store.feedback_push import FeedbackPushWriter
+            self.feedback_push = FeedbackSink(
+                FeedbackPushWriter(resources.get_feature_store(FEAST_REPO_PATH), max_batch_rows=FEEDBACK_PUSH_BATCH_SIZE),
+                max_queue_size=FEEDBACK_QUEUE_SIZE,
+                batch_size=FEEDBACK_PUSH_BATCH_SIZE,
+                flush_interval=FEEDBACK_PUSH_INTERVAL
+            )
 
-    @bentoml.api
+        self.model_watcher = None
+        if MODEL_WATCH_INTERVAL > 0:
+            self.model_watcher = ModelWatcher(
+                self.bento_model.tag.name,
+                self.bento_model.tag,
+                load_model=self.load_model,
+                validate=self.warm_up,
+                swap=self.swap_model,
+                poll_interval=MODEL_WATCH_INTERVAL,
+                pointer_path=MODEL_POINTER_PATH or None
+            ).start()
+
+    def load_model(self, bento_model) -> tuple:
+        if self.model_cache is not None:
+            with self.model_cache.lock(bento_model):
+                model, source = self.model_cache.load(bento_model, fast_path=FAST_PATH), "cache"
+                if model is None:
+                    self.model_cache.store(bento_model, bento_model.load_model())
+                    # Even the worker that materialized the cache serves from the shared mapping
+                    model, source = self.model_cache.load(bento_model, fast_path=FAST_PATH), "store"
+            if model is not None:
+                return model, source
+
+        model = bento_model.load_model()
+        if FAST_PATH:
+            model = load_fast_path(bento_model, model) or model
+        return model, "store"
+
+    def warm_up(self, model):
+        # One synthetic full batch pays the lazy-init costs before the first real request
+        sample = np.zeros((MAX_BATCH_SIZE, len(model_feature_names(model, FEATURE_COLUMNS))), dtype=np.float64)
+        pred = np.asarray(model.predict(sample)).reshape(-1)
+        if pred.shape[0] != MAX_BATCH_SIZE or not np.all(np.isfinite(pred)):
+            raise RuntimeError(f"Warm-up of {type(model).__name__} returned invalid predictions")
+
+    def swap_model(self, bento_model, model):
+        # A single reference assignment: each request reads self.serving once, so it builds its input and scores
+        # it with the same model, never a mix. The replaced model is released once in-flight requests finish with it
+        previous_tag = self.bento_model.tag
+        self.serving = (model, model_feature_names(model, FEATURE_COLUMNS))
+        self.bento_model = bento_model
+        set_model_version(previous_tag, serving=False)
+        set_model_version(bento_model.tag)
+        print(f"Swapped model {previous_tag} -> {bento_model.tag}")
+
+    @property
+    def online_features(self) -> "CachedOnlineFeatures":
+        # The feature store is only opened once the first house_id lookup arrives
+        with self._online_lock:
+            if self._online_features is None:
+                from feature_store.resource_registry import resources
+                from feature_store.online_feature_cache import OnlineFeatureCache, CachedOnlineFeatures
+                from feature_store.online_replica import SQLiteOnlineReplica
+                from feature_store.feature_repo.definitions import house_features
+
+                self.feature_cache = OnlineFeatureCache(
+                    max_size=FEATURE_CACHE_SIZE,
+                    ttl_seconds=house_features.ttl.total_seconds()
+                )
+                if ONLINE_REPLICA_PATH:
+                    self.online_replica = SQLiteOnlineReplica(
+                        ONLINE_REPLICA_PATH,
+                        columns=[feature.name for feature in house_features.features],
+                        max_staleness_seconds=ONLINE_REPLICA_MAX_STALENESS
+                    )
+                self._online_features = CachedOnlineFeatures(
+                    resources.get_feature_store(FEAST_REPO_PATH),
+                    [f"{house_features.name}:{feature.name}" for feature in house_features.features],
+                    self.feature_cache,
+                    replica=self.online_replica
+                )
+            return self._online_features
+
+    @bentoml.on_shutdown
+    def shutdown(self):
+        if self.model_watcher is not None:
+            self.model_watcher.stop()
+        self.feedback.close()
+        if self.feedback_push is not None:
+            self.feedback_push.close()
+
+    @bentoml.api(batchable=True, batch_dim=0, max_batch_size=MAX_BATCH_SIZE, max_latency_ms=MAX_LATENCY_MS)
     def predict(self, input_data:np.ndarray) -> np.ndarray:
-        pred = self.model.predict(input_data)
-        print(pred)
-        timestamps = pd.date_range( 
-            end=pd.Timestamp.now(),  
-            start=pd.Timestamp.now(),  
-            periods=1,  
-            freq=None).to_frame(name="event_timestamp", index=False) 
-        
-        with open('feedback.csv', 'a', newline='') as file: 
-            writer = csv.writer(file, quoting=csv.QUOTE_NONNUMERIC) 
-            val = starmap(lambda x,y,z:[x,y,z], np.asarray(input_data).tolist()) 
-            data = [] 
-            for i in next(val):
-                data.append(i)  
-            writer.writerow([timestamps.event_timestamp[0], data[0], data[1], data[2], pred[0]])
-        return np.asarray(pred)
-    
\ No newline at end of file
+        # input_data holds the rows of every request in the batch, stacked on axis 0, already decoded by BentoML;
+        # request decoding and batching wait are part of BentoML's request duration metric
+        return self._score(self.serving, input_data)
+
+    def _score(self, serving: tuple, input_data: np.ndarray) -> np.ndarray:
+        input_data = np.asarray(input_data)
+        model, feature_columns = serving
+        start = time.perf_counter()
+        pred = np.asarray(model.predict(input_data)).reshape(-1)
+        predicted = time.perf_counter()
+        timestamp = datetime.now()
+
+        # One feedback record per scored row, written off the request path; input columns follow the model's
+        # order, the log's columns are named
+        if FEEDBACK_ENABLED:
+            rows = feedback_rows(timestamp, feature_columns, input_data, pred)
+            dropped = len(rows) - self.feedback.submit(rows)
+            if dropped:
+                FEEDBACK_DROPPED.inc(dropped)
+            FEEDBACK_QUEUE_DEPTH.set(self.feedback.queue_depth())
+        logged = time.perf_counter()
+
+        STAGE_DURATION.labels(stage="predict").observe(predicted - start)
+        STAGE_DURATION.labels(stage="feedback").observe(logged - predicted)
+        BATCH_SIZE.observe(len(pred))
+        return pred
+
+    @bentoml.api
+    def predict_by_house_id(self, house_ids: list[int]) -> np.ndarray:
+        start = time.perf_counter()
+        features_df = self.online_features.get(house_ids)
+        STAGE_DURATION.labels(stage="feature_lookup").observe(time.perf_counter() - start)
+        # Scoring is by position, so the input follows the served model's column order; serving is read once so
+        # a concurrent swap cannot pair one model's column order with the other model
+        serving = self.serving
+        feature_columns = serving[1]
+        unknown = features_df.loc[features_df[feature_columns].isna().any(axis=1), "house_id"].tolist()
+        if unknown:
+            raise NotFound(f"No online features for house_id {unknown}")
+        input_data = features_df[feature_columns].to_numpy(dtype=np.float64)
+        pred = self._score(serving, input_data)
+
+        if self.feedback_push is not None:
+            timestamp = datetime.now(timezone.utc)
+            feedback_features = features_df[FEEDBACK_COLUMNS[1:-1]].itertuples(index=False, name=None)
+            rows = [
+                [timestamp, house_id, *row, value]
+                for house_id, row, value in zip(features_df["house_id"].tolist(), feedback_features, np.asarray(pred).tolist())
+            ]
+            dropped = len(rows) - self.feedback_push.submit(rows)
+            if dropped:
+                FEEDBACK_DROPPED.inc(dropped)
+        return pred
+
+    @bentoml.api
+    def feature_cache_stats(self) -> dict:
+        if self.feature_cache is None:
+            # No house_id lookup yet, so the cache and replica are not open
+            return {}
+        stats = self.feature_cache.stats()
+        if self.online_replica is not None:
+            stats["replica"] = self.online_replica.stats()
+        return stats
@@ -0,0 +1,128 @@
+import time
+from itertools import product
+
+import numpy as np
+from scipy.stats import rankdata
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.model_selection import check_cv
+
+from model_training.incremental import SufficientStatistics, build_estimator
+
+
+def _expand(param_grid) -> list:
+    grids = [param_grid] if isinstance(param_grid, dict) else list(param_grid)
+    candidates = []
+    for grid in grids:
+        keys = sorted(grid)
+        candidates.extend(dict(zip(keys, values)) for values in product(*(grid[k] for k in keys)))
+    return candidates
+
+
+# Drop-in for GridSearchCV over LinearRegression / Ridge (params fit_intercept, positive, alpha) scored by
+# negative MSE. Every fold's statistics are downdated from the full-data statistics, each training Gram
+# matrix is eigendecomposed once and reused across the whole alpha path, and test MSE comes from the test
+# fold's statistics, so the cost hardly depends on the number of folds or alphas. Exposes cv_results_,
+# best_params_, best_score_, best_index_, best_estimator_ and n_splits_ like GridSearchCV.
+class ClosedFormLinearCV:
+    def __init__(self, estimator=None, param_grid=None, cv=5, return_train_score=True):
+        self.estimator = estimator if estimator is not None else Ridge()
+        if not isinstance(self.estimator, (LinearRegression, Ridge)):
+            raise ValueError(f"ClosedFormLinearCV supports LinearRegression and Ridge, not {type(self.estimator).__name__}")
+        self.param_grid = param_grid if param_grid is not None else {}
+        self.cv = cv
+        self.return_train_score = return_train_score
+
+    def _solve_path(self, stats: SufficientStatistics, fit_intercept: bool, positive: bool, alphas: list) -> list:
+        if positive:
+            return [stats.solve(fit_intercept, positive=True, alpha=alpha) for alpha in alphas]
+        a, b = (stats.cxx, stats.cxy) if fit_intercept else stats.gram()
+        eigenvalues, eigenvectors = np.linalg.eigh(a)
+        projected = eigenvectors.T @ b
+        cutoff = max(eigenvalues.max(initial=0.0), 0.0) * len(b) * np.finfo(float).eps
+        solutions = []
+        for alpha in alphas:
+            shifted = eigenvalues + alpha
+            # Null directions get no weight at alpha 0, as in the minimum-norm least-squares solution
+            inverse = np.divide(1.0, shifted, out=np.zeros_like(shifted), where=shifted > cutoff)
+            coef = eigenvectors @ (inverse * projected)
+            intercept = stats.mean_y - stats.mean_x @ coef if fit_intercept else 0.0
+            solutions.append((coef, float(intercept)))
+        return solutions
+
+    def fit(self, X, y):
+        x_values = np.asarray(X, dtype=np.float64)
+        y_values = np.asarray(y, dtype=np.float64).reshape(-1)
+        candidates = _expand(self.param_grid)
+        splits = list(check_cv(self.cv).split(x_values, y_values))
+        self.n_splits_ = len(splits)
+
+        began = time.perf_counter()
+        folds = [SufficientStatistics.from_arrays(x_values[test], y_values[test]) for _, test in splits]
+        total = SufficientStatistics(x_values.shape[1])
+        for fold in folds:
+            total.merge(fold)
+        stats_time = (time.perf_counter() - began) / self.n_splits_
+
+        default_alpha = getattr(self.estimator, "alpha", 0.0) if isinstance(self.estimator, Ridge) else 0.0
+        settings = [(
+            c.get("fit_intercept", self.estimator.fit_intercept),
+            c.get("positive", self.estimator.positive),
+            float(c.get("alpha", default_alpha))
+        ) for c in candidates]
+        n = len(candidates)
+        test_scores = np.zeros((n, self.n_splits_))
+        train_scores = np.zeros((n, self.n_splits_))
+        fit_times = np.zeros((n, self.n_splits_))
+        score_times = np.zeros((n, self.n_splits_))
+
+        for k, test_stats in enumerate(folds):
+            train_stats = total.subtract(test_stats)
+            # One decomposition per (fold, fit_intercept, positive); all alphas come from it
+            for fit_intercept, positive in sorted({(s[0], s[1]) for s in settings}):
+                group = [i for i, s in enumerate(settings) if s[0] == fit_intercept and s[1] == positive]
+                alphas = [settings[i][2] for i in group]
+                start = time.perf_counter()
+                solutions = self._solve_path(train_stats, fit_intercept, positive, alphas)
+                per_fit = (time.perf_counter() - start) / len(group) + stats_time
+                for i, (coef, intercept) in zip(group, solutions):
+                    start = time.perf_counter()
+                    test_scores[i, k] = -test_stats.sse(coef, intercept) / test_stats.n
+                    train_scores[i, k] = -train_stats.sse(coef, intercept) / train_stats.n
+                    score_times[i, k] = time.perf_counter() - start
+                    fit_times[i, k] = per_fit
+
+        self.cv_results_ = {
+            "params": candidates,
+            "mean_fit_time": fit_times.mean(axis=1),
+            "std_fit_time": fit_times.std(axis=1),
+            "mean_score_time": score_times.mean(axis=1),
+            "std_score_time": score_times.std(axis=1),
+        }
+        for key in sorted({key for c in candidates for key in c}):
+            values = np.ma.MaskedArray(np.empty(n, dtype=object), mask=[key not in c for c in candidates])
+            for i, c in enumerate(candidates):
+                if key in c:
+                    values[i] = c[key]
+            self.cv_results_[f"param_{key}"] = values
+        for k in range(self.n_splits_):
+            self.cv_results_[f"split{k}_test_score"] = test_scores[:, k]
+        self.cv_results_["mean_test_score"] = test_scores.mean(axis=1)
+        self.cv_results_["std_test_score"] = test_scores.std(axis=1)
+        self.cv_results_["rank_test_score"] = rankdata(-test_scores.mean(axis=1), method="min").astype(np.int32)
+        if self.return_train_score:
+            for k in range(self.n_splits_):
+                self.cv_results_[f"split{k}_train_score"] = train_scores[:, k]
+            self.cv_results_["mean_train_score"] = train_scores.mean(axis=1)
+            self.cv_results_["std_train_score"] = train_scores.std(axis=1)
+
+        self.best_index_ = int(np.argmax(self.cv_results_["mean_test_score"]))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(self.cv_results_["mean_test_score"][self.best_index_])
+        # The refit is the exact solve on the full-data statistics; sklearn's Ridge(positive=True) only
+        # approximates it with lbfgs
+        start = time.perf_counter()
+        fit_intercept, positive, alpha = settings[self.best_index_]
+        coef, intercept = total.solve(fit_intercept, positive, alpha)
+        self.best_estimator_ = build_estimator(getattr(X, "columns", None), coef, intercept, fit_intercept, positive, alpha)
+        self.refit_time_ = time.perf_counter() - start
+        return self
@@ -1,13 +1,27 @@
-from sklearn.linear_model import LinearRegression
+from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import root_mean_squared_error, mean_absolute_error, make_scorer, r2_score, mean_squared_error
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, GridSearchCV, HalvingGridSearchCV
 import pandas as pd
 import numpy as np
+import copy
+import time
 import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from sklearn.base import clone
 import mlflow
+from mlflow.tracking import MlflowClient
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID, MLFLOW_RUN_NAME
 from mlflow.models.signature import infer_signature
 from mlflow.sklearn import log_model
 from dotenv import load_dotenv
+from model_training.streaming import StreamingLinearTrainer
+from model_training.closed_form_cv import ClosedFormLinearCV
 import os
 from pathlib import Path
 
@@ -19,40 +33,138 @@ EXPERIMENT_NAME = os.getenv("EXPERIMENT_NAME", "Default_Experiment")
 # EXPERIMENT_URI = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
 EXPERIMENT_URI = "https://dagshub.com/kavyajg1804/e2e-mlops-setup.mlflow"
 
+# "grid": the original LinearRegression grid, "halving": successive halving over linear and tree regressors,
+# "closed_form": the LinearRegression grid plus a ridge alpha path, cross-validated from per-fold statistics
+SEARCH_MODES = ("grid", "halving", "closed_form")
+
+# alpha 0 is plain LinearRegression
+CLOSED_FORM_SEARCH_SPACE = {
+    "alpha": [0.0, 0.001, 0.00316, 0.01, 0.0316, 0.1, 0.316, 1.0, 3.16, 10.0, 31.6, 100.0, 316.0, 1000.0],
+    "fit_intercept": [True, False],
+    "positive": [True, False],
+}
+
+# Halving candidates swap the "model" step of a scaler + model Pipeline. The penalised linear models need
+# standardised features, otherwise alpha shrinks each coefficient by the scale of its column; trees skip the scaler.
+HALVING_SEARCH_SPACE = [
+    {"model": [LinearRegression()], "model__fit_intercept": [True, False], "model__positive": [True, False]},
+    {"model": [Ridge()], "model__alpha": [0.001, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0], "model__fit_intercept": [True, False]},
+    {"model": [Lasso(max_iter=10000)], "model__alpha": [0.001, 0.01, 0.1, 1.0, 10.0, 100.0]},
+    {"model": [ElasticNet(max_iter=10000)], "model__alpha": [0.01, 0.1, 1.0, 10.0], "model__l1_ratio": [0.2, 0.5, 0.8]},
+    {"scaler": ["passthrough"], "model": [RandomForestRegressor(n_estimators=100, random_state=0)], "model__max_depth": [None, 8], "model__min_samples_leaf": [1, 5]},
+    {"scaler": ["passthrough"], "model": [HistGradientBoostingRegressor(random_state=0)], "model__learning_rate": [0.05, 0.1], "model__max_leaf_nodes": [15, 31]},
+]
+
+
+def fold_scaler(scaler: StandardScaler, model):
+    # A copy of a linear model fitted on scaler output, with the scaling folded into coef_ / intercept_ so it
+    # predicts on raw features: coef * (x - mean) / scale + b == (coef / scale) * x + (b - coef . mean / scale)
+    folded = copy.deepcopy(model)
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    folded.coef_ = coef / scaler.scale_
+    folded.intercept_ = model.intercept_ - coef @ (scaler.mean_ / scaler.scale_)
+    if hasattr(scaler, "feature_names_in_"):
+        folded.feature_names_in_ = scaler.feature_names_in_
+    return folded
+
 class HousePriceModel:
     def __init__(self):
         self.x_train = self.x_test = self.y_train = self.y_test = None
         self.grid_search = None
+        self.streaming = self.streaming_metrics = None
     
     # Custom scorer for MSE
     def mse_scorer(self, y_true, y_pred):
         return mean_squared_error(y_true, y_pred)
     
-    def train_model(self, features, target, test_size=0.25):
-        params = {
-            'fit_intercept': [True, False],
-            'positive': [True, False]
-        }
+    def train_model(self, features, target, test_size=0.25, search="grid"):
+        if search not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search {search}, expected one of {SEARCH_MODES}")
+
+        if search == "halving":
+            # Every candidate starts on a small sample; only the best third moves on to 3x the rows, on all cores
+            self.grid_search = HalvingGridSearchCV(
+                estimator=Pipeline([("scaler", StandardScaler()), ("model", LinearRegression())]),
+                param_grid=HALVING_SEARCH_SPACE,
+                scoring="neg_mean_squared_error",
+                cv=5,
+                factor=3,
+                n_jobs=-1,
+                return_train_score=True,
+            )
+        elif search == "closed_form":
+            self.grid_search = ClosedFormLinearCV(
+                estimator=Ridge(),
+                param_grid=CLOSED_FORM_SEARCH_SPACE,
+                cv=5,
+                return_train_score=True,
+            )
+        else:
+            params = {
+                'fit_intercept': [True, False],
+                'positive': [True, False]
+            }
 
-        model = LinearRegression()
+            model = LinearRegression()
 
-        # setup GridSearchCV
-        self.grid_search = GridSearchCV(
-            estimator=model,
-            param_grid=params,
-            scoring=make_scorer(self.mse_scorer, greater_is_better=False), # Negative MSE
-            cv=5,
-            return_train_score=True,
-        )
+            # setup GridSearchCV
+            self.grid_search = GridSearchCV(
+                estimator=model,
+                param_grid=params,
+                scoring=make_scorer(self.mse_scorer, greater_is_better=False), # Negative MSE
+                cv=5,
+                return_train_score=True,
+            )
 
         self.x_train, self.x_test, self.y_train, self.y_test = train_test_split(features, target, test_size=test_size)
         self.grid_search.fit(self.x_train, self.y_train)
+        timings = self.search_timings()
+        print(f"Searched {len(timings)} candidate fits, total fit time {timings['total_fit_time'].sum():.2f}s")
 
         # Save the trained model
         with open(MODEL_PATH, "wb") as f:
-            pickle.dump(self.grid_search.best_estimator_, f)
+            pickle.dump(self.best_estimator(), f)
         print("Model trained and saved as model.pkl")
 
+    def train_streaming(self, batches, feature_names, test_size=0.25, fit_intercept=True, positive=False, alpha=0.0):
+        # Out-of-core alternative to train_model: one pass over record batches with a hash split on house_id,
+        # so memory depends on the batch size and the number of features, not on the number of rows
+        self.streaming = StreamingLinearTrainer(
+            feature_names, test_size=test_size, fit_intercept=fit_intercept, positive=positive, alpha=alpha
+        )
+        model = self.streaming.fit(batches)
+        self.streaming_metrics = self.streaming.metrics(model)
+        with open(MODEL_PATH, "wb") as f:
+            pickle.dump(model, f)
+        print(f"Model trained on streamed batches and saved as model.pkl: {self.streaming_metrics}")
+        return model
+
+    def best_estimator(self):
+        # Halving search wraps candidates in a scaler + model Pipeline; a linear winner is saved and served as the
+        # plain regressor with the scaler folded in, so the fast path still applies
+        estimator = self.grid_search.best_estimator_
+        if not isinstance(estimator, Pipeline):
+            return estimator
+        scaler, model = estimator.named_steps.get("scaler"), estimator.steps[-1][1]
+        if isinstance(scaler, StandardScaler) and hasattr(model, "coef_"):
+            return fold_scaler(scaler, model)
+        return model if scaler in (None, "passthrough") else estimator
+
+    def search_timings(self) -> pd.DataFrame:
+        # Per-candidate fit / score times; halving rows also carry the iteration and the number of rows used
+        results = self.grid_search.cv_results_
+        n_splits = self.grid_search.n_splits_
+        timings = pd.DataFrame({
+            "params": [str(params) for params in results["params"]],
+            "iter": results.get("iter", np.zeros(len(results["params"]), dtype=int)),
+            "n_resources": results.get("n_resources", np.full(len(results["params"]), len(self.x_train))),
+            "mean_fit_time": results["mean_fit_time"],
+            "mean_score_time": results["mean_score_time"],
+            "mean_test_score": results["mean_test_score"],
+        })
+        timings["total_fit_time"] = timings["mean_fit_time"] * n_splits
+        return timings
+
     # Load model 
     def load_model(self):
         #self.model = None
@@ -82,9 +194,11 @@ class HousePriceModel:
         }
         return metric_dict
     
-    def configure_mlflow(self):
-        mlflow.set_tracking_uri(uri= EXPERIMENT_URI)
-        print(f"MLflow Tracking URI: {EXPERIMENT_URI}")
+    def configure_mlflow(self, tracking_uri=None):
+        # tracking_uri / MLFLOW_TRACKING_URI can point at a local store, e.g. "file:./mlruns"
+        tracking_uri = tracking_uri or os.getenv("MLFLOW_TRACKING_URI", EXPERIMENT_URI)
+        mlflow.set_tracking_uri(uri= tracking_uri)
+        print(f"MLflow Tracking URI: {tracking_uri}")
 
         try:
             exp= mlflow.get_experiment_by_name(EXPERIMENT_NAME)
@@ -100,28 +214,85 @@ class HousePriceModel:
             print(f"MLflow Experiment: {EXPERIMENT_NAME}")
             return mlflow.get_experiment_by_name(EXPERIMENT_NAME)
         
-    def log_gridsearch(self):
-        for i, params in enumerate(self.grid_search.cv_results_["params"]):
-            with mlflow.start_run(run_name="child_run_" + str(i), nested=True):  # Use nested=True for sub-runs
-                # Get metrics from cv_results_
-                mean_test_score = self.grid_search.cv_results_['mean_test_score'][i]
-                std_test_score = self.grid_search.cv_results_['std_test_score'][i]
-                
-                # Log parameters and cross-validation metrics
-                mlflow.log_params(params)
-                mlflow.log_metric("mean_cv_score", mean_test_score)
-                mlflow.log_metric("std_cv_score", std_test_score)
-
-                # Refit model on the best parameters and evaluate on test data
-                model = self.grid_search.best_estimator_.set_params(**params)
-                model.fit(self.x_train, self.y_train)
-                y_pred = model.predict(self.x_test)
-                mlflow.log_metrics(self.metrics(y_pred))
-                mlflow.sklearn.log_model(model, "model")
-
-                print(f"Logged run with params: {params}, mean_cv_score: {mean_test_score:.4f}, std_test_score: {std_test_score:.4f}")
-
-    def register(self):
+    def log_gridsearch(self, parent_run, log_models=False, max_workers=4):
+        # Child runs come straight from cv_results_: no refit, one log_batch call per candidate.
+        # With log_models, candidates are refit on clones and uploaded in the background; the returned
+        # futures finish once every artifact is logged.
+        client = MlflowClient()
+        results = self.grid_search.cv_results_
+        extra = [key for key in ("iter", "n_resources") if key in results]
+        executor = ThreadPoolExecutor(max_workers=max_workers) if log_models else None
+        futures = []
+
+        for i, params in enumerate(results["params"]):
+            child = client.create_run(
+                experiment_id=parent_run.info.experiment_id,
+                tags={MLFLOW_PARENT_RUN_ID: parent_run.info.run_id, MLFLOW_RUN_NAME: "child_run_" + str(i)}
+            )
+            timestamp = int(time.time() * 1000)
+            metrics = {
+                "mean_cv_score": results["mean_test_score"][i],
+                "std_cv_score": results["std_test_score"][i],
+                "mean_fit_time": results["mean_fit_time"][i],
+                "mean_score_time": results["mean_score_time"][i],
+            }
+            if "mean_train_score" in results:
+                metrics["mean_train_score"] = results["mean_train_score"][i]
+            client.log_batch(
+                child.info.run_id,
+                metrics=[Metric(key, float(value), timestamp, 0) for key, value in metrics.items()],
+                params=[Param(key, str(value)) for key, value in params.items()],
+                tags=[RunTag(key, str(results[key][i])) for key in extra]
+            )
+            if log_models:
+                futures.append(executor.submit(self._log_child_model, client, child.info.run_id, params))
+            else:
+                client.set_terminated(child.info.run_id)
+
+        print(f"Logged {len(results['params'])} child runs under {parent_run.info.run_id}")
+        if executor is not None:
+            executor.shutdown(wait=False)
+        return futures
+
+    def _log_child_model(self, client, run_id, params):
+        try:
+            # Halving params hold estimator instances shared by every candidate, so those are cloned too
+            model = clone(self.grid_search.estimator).set_params(**{key: clone(value, safe=False) for key, value in params.items()})
+            model.fit(self.x_train, self.y_train)
+            timestamp = int(time.time() * 1000)
+            test_metrics = self.metrics(model.predict(self.x_test))
+            client.log_batch(run_id, metrics=[Metric(key, float(value), timestamp, 0) for key, value in test_metrics.items()])
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # Default requirements skip the per-model dependency inference subprocess
+                mlflow.sklearn.save_model(
+                    model, os.path.join(tmp_dir, "model"), pip_requirements=mlflow.sklearn.get_default_pip_requirements()
+                )
+                client.log_artifacts(run_id, os.path.join(tmp_dir, "model"), "model")
+            client.set_terminated(run_id)
+        except Exception as e:
+            client.set_terminated(run_id, status="FAILED")
+            print(f"Logging model for child run {run_id} failed: {e}")
+
+    def register_streaming(self):
+        with mlflow.start_run(run_name="LinearReg_Streaming", log_system_metrics=True):
+            model = self.load_model()
+            mlflow.log_params({
+                "fit_intercept": self.streaming.fit_intercept,
+                "positive": self.streaming.positive,
+                "alpha": self.streaming.alpha,
+                "test_size": self.streaming.test_size,
+            })
+            mlflow.log_metrics({**self.streaming_metrics, "train_rows": self.streaming.train_stats.n, "test_rows": self.streaming.test_stats.n})
+            model_info = log_model(
+                sk_model=model,
+                artifact_path="house_model",
+                signature=infer_signature(np.array(self.streaming.sample), np.array(model.predict(self.streaming.sample))),
+                input_example=self.streaming.sample,
+                registered_model_name="house_price_prediction"
+            )
+        return model_info
+
+    def register(self, log_models=False):
         with mlflow.start_run(run_name="LinearReg_GridSearch_Best", log_system_metrics=True) as run:
             # Log the best parameters and metrics
             best_params = self.grid_search.best_params_
@@ -134,15 +305,16 @@ class HousePriceModel:
             #Define signature
             signature = infer_signature(np.array(self.x_train), np.array(self.predict(self.x_test)))
 
-            # Log all runs for each parameter combination
-            self.log_gridsearch()
+            # Log all runs for each parameter combination; model uploads, if any, overlap with the best model's
+            pending = self.log_gridsearch(run, log_models=log_models)
 
             #Log and Register best model
             model_info = log_model(
-                sk_model=self.grid_search.best_estimator_,
+                sk_model=self.best_estimator(),
                 artifact_path="house_model",
                 signature=signature,
                 input_example= self.x_train,
                 registered_model_name="house_price_prediction"
             )
+            wait(pending)
         return model_info
@@ -0,0 +1,276 @@
+import os
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import nnls
+from sklearn.linear_model import LinearRegression, Ridge
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+STATS_PATH = os.path.join(MODEL_DIR, "house_regression_stats.npz")
+BUCKET_SECONDS = 24 * 3600
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def build_estimator(feature_names: list, coef, intercept: float, fit_intercept: bool = True, positive: bool = False,
+                    alpha: float = 0.0):
+    # A fitted LinearRegression / Ridge from a solved coefficient vector, interchangeable with one from sklearn's fit
+    if alpha:
+        model = Ridge(alpha=alpha, fit_intercept=fit_intercept, positive=positive)
+    else:
+        model = LinearRegression(fit_intercept=fit_intercept, positive=positive)
+    model.coef_ = np.asarray(coef, dtype=np.float64)
+    model.intercept_ = float(intercept)
+    model.n_features_in_ = len(model.coef_)
+    if feature_names is not None:
+        model.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    return model
+
+
+def _bucket(ts) -> int:
+    ts = pd.Timestamp(ts)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int((ts - pd.Timestamp(EPOCH)).total_seconds() // BUCKET_SECONDS)
+
+
+# Centered sufficient statistics of one block of rows: weighted count, means and co-moments.
+# Blocks merge exactly (Chan et al.), so centered Gram / X.y never come from subtracting large raw sums.
+class SufficientStatistics:
+    def __init__(self, n_features: int):
+        self.n = 0.0
+        self.mean_x = np.zeros(n_features)
+        self.mean_y = 0.0
+        self.cxx = np.zeros((n_features, n_features))
+        self.cxy = np.zeros(n_features)
+        self.cyy = 0.0
+
+    @classmethod
+    def from_arrays(cls, x: np.ndarray, y: np.ndarray, weights: np.ndarray = None) -> "SufficientStatistics":
+        stats = cls(x.shape[1])
+        w = np.ones(len(y)) if weights is None else np.asarray(weights, dtype=np.float64)
+        stats.n = float(w.sum())
+        if stats.n == 0:
+            return stats
+        stats.mean_x = w @ x / stats.n
+        stats.mean_y = float(w @ y / stats.n)
+        dx, dy = x - stats.mean_x, y - stats.mean_y
+        stats.cxx = (dx * w[:, None]).T @ dx
+        stats.cxy = (dx * w[:, None]).T @ dy
+        stats.cyy = float(w @ (dy * dy))
+        return stats
+
+    def merge(self, other: "SufficientStatistics", weight: float = 1.0) -> "SufficientStatistics":
+        # Adds other, scaled by weight, in place
+        n_b = other.n * weight
+        if n_b == 0:
+            return self
+        n = self.n + n_b
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        factor = self.n * n_b / n
+        self.cxx = self.cxx + other.cxx * weight + factor * np.outer(dx, dx)
+        self.cxy = self.cxy + other.cxy * weight + factor * dx * dy
+        self.cyy = self.cyy + other.cyy * weight + factor * dy * dy
+        self.mean_x = self.mean_x + dx * n_b / n
+        self.mean_y = self.mean_y + dy * n_b / n
+        self.n = n
+        return self
+
+    def subtract(self, other: "SufficientStatistics") -> "SufficientStatistics":
+        # Downdate: statistics of this block with other's rows removed, other being a subset of it
+        n = self.n - other.n
+        result = SufficientStatistics(len(self.mean_x))
+        if n <= 0:
+            return result
+        result.n = n
+        result.mean_x = (self.n * self.mean_x - other.n * other.mean_x) / n
+        result.mean_y = (self.n * self.mean_y - other.n * other.mean_y) / n
+        dx, dy = other.mean_x - result.mean_x, other.mean_y - result.mean_y
+        factor = n * other.n / self.n
+        result.cxx = self.cxx - other.cxx - factor * np.outer(dx, dx)
+        result.cxy = self.cxy - other.cxy - factor * dx * dy
+        result.cyy = self.cyy - other.cyy - factor * dy * dy
+        return result
+
+    def gram(self) -> tuple:
+        # Uncentered X'X and X'y, for models without an intercept
+        return self.cxx + self.n * np.outer(self.mean_x, self.mean_x), self.cxy + self.n * self.mean_x * self.mean_y
+
+    def solve(self, fit_intercept: bool = True, positive: bool = False, alpha: float = 0.0) -> tuple:
+        # O(features^3) re-solve of the (ridge) normal equations, independent of the number of rows
+        a, b = (self.cxx, self.cxy) if fit_intercept else self.gram()
+        a = a + alpha * np.eye(len(b))
+        if positive:
+            # min b'Ab - 2b'c with b >= 0 is NNLS on the Cholesky factor of A, solved on unit-scaled
+            # columns so the stabilising jitter does not depend on feature magnitudes
+            scale = np.sqrt(np.where(np.diag(a) > 0, np.diag(a), 1.0))
+            scaled = a / np.outer(scale, scale) + 1e-12 * np.eye(len(b))
+            lower = np.linalg.cholesky(scaled)
+            coef, _ = nnls(lower.T, np.linalg.solve(lower, b / scale))
+            coef = coef / scale
+        else:
+            coef = np.linalg.lstsq(a, b, rcond=None)[0]
+        intercept = self.mean_y - self.mean_x @ coef if fit_intercept else 0.0
+        return coef, float(intercept)
+
+    def sse(self, coef: np.ndarray, intercept: float) -> float:
+        # Weighted sum of squared residuals of (coef, intercept) over the folded rows
+        shift = self.mean_y - intercept - self.mean_x @ coef
+        return float(self.cyy - 2 * coef @ self.cxy + coef @ self.cxx @ coef + self.n * shift * shift)
+
+
+# Keeps sufficient statistics per day bucket and re-solves the linear model from them. New rows are
+# folded in without touching old data; "window" keeps the last window_days buckets and "decay" weights
+# each bucket by 0.5 ** (age / half_life_days), so old data ages out.
+class IncrementalLinearTrainer:
+    def __init__(self, feature_names: list, fit_intercept: bool = True, positive: bool = False, alpha: float = 0.0,
+                 mode: str = "full", window_days: float = None, half_life_days: float = None):
+        if mode not in ("full", "window", "decay"):
+            raise ValueError(f"Unsupported mode {mode}, expected full, window or decay")
+        if mode == "window" and not window_days:
+            raise ValueError("window mode needs window_days")
+        if mode == "decay" and not half_life_days:
+            raise ValueError("decay mode needs half_life_days")
+        self.feature_names = list(feature_names)
+        self.fit_intercept = fit_intercept
+        self.positive = positive
+        self.alpha = alpha
+        self.mode = mode
+        self.window_days = window_days
+        self.half_life_days = half_life_days
+        self.buckets = {}
+        # FeedbackLog.read_after position of the last folded feedback row
+        self.position = None
+
+    @classmethod
+    def from_model(cls, model, **kwargs) -> "IncrementalLinearTrainer":
+        if type(model) not in (LinearRegression, Ridge):
+            raise ValueError(f"Incremental training supports LinearRegression and Ridge, not {type(model).__name__}")
+        return cls(
+            list(model.feature_names_in_),
+            fit_intercept=model.fit_intercept,
+            positive=model.positive,
+            alpha=getattr(model, "alpha", 0.0),
+            **kwargs
+        )
+
+    @property
+    def count(self) -> float:
+        return sum(stats.n for stats in self.buckets.values())
+
+    def fold(self, x: pd.DataFrame, y, timestamps=None) -> int:
+        x_values = np.asarray(x[self.feature_names], dtype=np.float64)
+        y_values = np.asarray(y, dtype=np.float64).reshape(-1)
+        if timestamps is None:
+            groups = {_bucket(datetime.now(timezone.utc)): np.arange(len(y_values))}
+        else:
+            keys = np.array([_bucket(ts) for ts in timestamps])
+            groups = {int(key): np.flatnonzero(keys == key) for key in np.unique(keys)}
+
+        for key, rows in groups.items():
+            block = SufficientStatistics.from_arrays(x_values[rows], y_values[rows])
+            self.buckets.setdefault(key, SufficientStatistics(len(self.feature_names))).merge(block)
+        return len(y_values)
+
+    def weight(self, bucket: int, now: int) -> float:
+        age = now - bucket
+        if self.mode == "window":
+            return 1.0 if age < self.window_days else 0.0
+        if self.mode == "decay":
+            return 0.5 ** (age / self.half_life_days)
+        return 1.0
+
+    def statistics(self, now: datetime = None) -> SufficientStatistics:
+        current = _bucket(now or datetime.now(timezone.utc))
+        total = SufficientStatistics(len(self.feature_names))
+        for key in sorted(self.buckets):
+            total.merge(self.buckets[key], weight=self.weight(key, current))
+        return total
+
+    def prune(self, now: datetime = None, min_weight: float = 1e-6):
+        # Buckets that no longer contribute are dropped so the state stays bounded
+        current = _bucket(now or datetime.now(timezone.utc))
+        self.buckets = {k: v for k, v in self.buckets.items() if self.weight(k, current) > min_weight}
+
+    def to_estimator(self, now: datetime = None):
+        # A fitted LinearRegression / Ridge, interchangeable with one trained by HousePriceModel
+        stats = self.statistics(now)
+        needed = len(self.feature_names) + int(self.fit_intercept)
+        if stats.n < needed:
+            # Every bucket aged out (window / decay): solving would return an all-zero model
+            raise ValueError(f"Only {stats.n:.3g} weighted rows left in the {self.mode} statistics, {needed} needed to solve")
+        coef, intercept = stats.solve(self.fit_intercept, self.positive, self.alpha)
+        return build_estimator(self.feature_names, coef, intercept, self.fit_intercept, self.positive, self.alpha)
+
+    def verify_against_refit(self, x: pd.DataFrame, y, timestamps=None, now: datetime = None, rtol: float = 1e-6) -> dict:
+        # Refits sklearn on the raw rows (weighted like the buckets) and compares predictions
+        current = _bucket(now or datetime.now(timezone.utc))
+        if timestamps is None:
+            weights = np.ones(len(x))
+        else:
+            weights = np.array([self.weight(_bucket(ts), current) for ts in timestamps])
+        keep = weights > 0
+        if self.alpha:
+            reference = Ridge(alpha=self.alpha, fit_intercept=self.fit_intercept, positive=self.positive)
+        else:
+            reference = LinearRegression(fit_intercept=self.fit_intercept, positive=self.positive)
+        reference.fit(x[self.feature_names][keep], np.asarray(y)[keep], sample_weight=weights[keep])
+
+        model = self.to_estimator(now)
+        expected = reference.predict(x[self.feature_names])
+        actual = model.predict(x[self.feature_names])
+        max_diff = float(np.max(np.abs(actual - expected))) if len(x) else 0.0
+        scale = float(np.max(np.abs(expected))) if len(x) else 1.0
+        return {
+            "max_prediction_diff": max_diff,
+            "max_coef_diff": float(np.max(np.abs(model.coef_ - reference.coef_))),
+            "ok": max_diff <= rtol * max(scale, 1.0),
+        }
+
+    def save(self, path: str = STATS_PATH):
+        keys = sorted(self.buckets)
+        p = len(self.feature_names)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            feature_names=np.asarray(self.feature_names),
+            config=np.asarray([self.mode, str(self.fit_intercept), str(self.positive), str(self.alpha),
+                               str(self.window_days or ""), str(self.half_life_days or "")]),
+            position=np.asarray(json.dumps(self.position) if self.position else ""),
+            buckets=np.asarray(keys, dtype=np.int64),
+            n=np.asarray([self.buckets[k].n for k in keys]),
+            mean_x=np.asarray([self.buckets[k].mean_x for k in keys]).reshape(len(keys), p),
+            mean_y=np.asarray([self.buckets[k].mean_y for k in keys]),
+            cxx=np.asarray([self.buckets[k].cxx for k in keys]).reshape(len(keys), p, p),
+            cxy=np.asarray([self.buckets[k].cxy for k in keys]).reshape(len(keys), p),
+            cyy=np.asarray([self.buckets[k].cyy for k in keys]),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = STATS_PATH) -> "IncrementalLinearTrainer":
+        with np.load(path) as data:
+            mode, fit_intercept, positive, alpha, window_days, half_life_days = data["config"].tolist()
+            trainer = cls(
+                data["feature_names"].tolist(),
+                fit_intercept=fit_intercept == "True",
+                positive=positive == "True",
+                alpha=float(alpha),
+                mode=mode,
+                window_days=float(window_days) if window_days else None,
+                half_life_days=float(half_life_days) if half_life_days else None
+            )
+            if "position" not in data.files:
+                raise ValueError(f"{path} tracks feedback by event time, which skips late segments; delete it to rebuild")
+            position = str(data["position"])
+            trainer.position = json.loads(position) if position else None
+            for i, key in enumerate(data["buckets"].tolist()):
+                stats = SufficientStatistics(len(trainer.feature_names))
+                stats.n = float(data["n"][i])
+                stats.mean_x = data["mean_x"][i]
+                stats.mean_y = float(data["mean_y"][i])
+                stats.cxx = data["cxx"][i]
+                stats.cxy = data["cxy"][i]
+                stats.cyy = float(data["cyy"][i])
+                trainer.buckets[key] = stats
+        return trainer
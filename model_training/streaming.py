@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import sqlalchemy as db
+
+from model_training.incremental import SufficientStatistics, IncrementalLinearTrainer
+
+# hash_array needs a 16 character key; fixing it keeps the split identical across runs and machines
+SPLIT_HASH_KEY = "house-split-0001"
+SPLIT_BUCKETS = 10_000
+
+
+def test_mask(house_ids, test_size: float = 0.25) -> np.ndarray:
+    # A house always lands on the same side of the split, whatever the batch it arrives in
+    hashes = pd.util.hash_array(np.asarray(house_ids), hash_key=SPLIT_HASH_KEY, categorize=False)
+    return (hashes % SPLIT_BUCKETS) < int(test_size * SPLIT_BUCKETS)
+
+
+def iter_parquet_batches(features_path: str, target_path: str, columns: list, target: str = "price",
+                         batch_size: int = 100_000):
+    # Features and target live in separate files aligned by row; both are streamed from memory-mapped
+    # files and re-chunked so every yielded batch pairs the same rows
+    sources = [
+        pq.ParquetFile(features_path, memory_map=True).iter_batches(batch_size=batch_size, columns=columns),
+        pq.ParquetFile(target_path, memory_map=True).iter_batches(batch_size=batch_size, columns=[target]),
+    ]
+    buffers = [[], []]
+    sizes = [0, 0]
+    exhausted = [False, False]
+    while True:
+        for i, source in enumerate(sources):
+            while not exhausted[i] and sizes[i] < batch_size:
+                batch = next(source, None)
+                if batch is None:
+                    exhausted[i] = True
+                else:
+                    buffers[i].append(batch.to_pandas())
+                    sizes[i] += batch.num_rows
+        rows = min(sizes)
+        if rows == 0:
+            return
+        frames = []
+        for i in range(2):
+            frame = pd.concat(buffers[i], ignore_index=True)
+            frames.append(frame.iloc[:rows])
+            buffers[i] = [frame.iloc[rows:]]
+            sizes[i] -= rows
+        yield pd.concat([frames[0], frames[1].reset_index(drop=True)], axis=1)
+
+
+def iter_offline_batches(engine: db.Engine, columns: list, target: str = "price", batch_size: int = 100_000):
+    # Server-side cursor over the offline store, so only one batch is held in memory
+    select = ", ".join(["f.house_id"] + [f'f."{c}"' for c in columns if c != "house_id"] + [f't."{target}"'])
+    query = db.text(
+        f"SELECT {select} FROM house_features_sql f "
+        f"JOIN house_target_sql t ON t.house_id = f.house_id AND t.event_timestamp = f.event_timestamp"
+    )
+    with engine.connect().execution_options(stream_results=True) as connection:
+        yield from pd.read_sql(query, connection, chunksize=batch_size)
+
+
+# Single pass over record batches: training rows are folded into normal-equation statistics and test
+# rows into their own statistics, from which the test MSE / RMSE / R2 of the final model follow exactly
+class StreamingLinearTrainer:
+    def __init__(self, feature_names: list, target: str = "price", test_size: float = 0.25, key: str = "house_id",
+                 fit_intercept: bool = True, positive: bool = False, alpha: float = 0.0):
+        self.feature_names = list(feature_names)
+        self.target = target
+        self.test_size = test_size
+        self.key = key
+        self.fit_intercept = fit_intercept
+        self.positive = positive
+        self.alpha = alpha
+        self.train_stats = SufficientStatistics(len(self.feature_names))
+        self.test_stats = SufficientStatistics(len(self.feature_names))
+        self.sample = None
+        self.batches = 0
+
+    def partial_fit(self, batch: pd.DataFrame):
+        mask = test_mask(batch[self.key].to_numpy(), self.test_size)
+        x = batch[self.feature_names].to_numpy(dtype=np.float64)
+        y = batch[self.target].to_numpy(dtype=np.float64)
+        self.train_stats.merge(SufficientStatistics.from_arrays(x[~mask], y[~mask]))
+        self.test_stats.merge(SufficientStatistics.from_arrays(x[mask], y[mask]))
+        if self.sample is None and (~mask).any():
+            self.sample = batch.loc[~mask, self.feature_names].head(5).reset_index(drop=True)
+        self.batches += 1
+        return self
+
+    def fit(self, batches):
+        for batch in batches:
+            self.partial_fit(batch)
+        print(f"Streamed {self.batches} batches: {self.train_stats.n:.0f} train rows, {self.test_stats.n:.0f} test rows")
+        return self.to_estimator()
+
+    def to_estimator(self):
+        trainer = IncrementalLinearTrainer(self.feature_names, self.fit_intercept, self.positive, self.alpha)
+        trainer.buckets[0] = self.train_stats
+        return trainer.to_estimator()
+
+    def metrics(self, model) -> dict:
+        # MAE needs the residuals themselves and is not available from the statistics
+        n = self.test_stats.n
+        if n == 0:
+            return {}
+        mse = self.test_stats.sse(np.asarray(model.coef_, dtype=np.float64), float(model.intercept_)) / n
+        return {
+            "rmse": float(np.sqrt(mse)),
+            "mse": mse,
+            "r2": 1.0 - mse * n / self.test_stats.cyy if self.test_stats.cyy else 0.0,
+        }
@@ -1,48 +1,114 @@
 import sys
 import os
+import argparse
 from sklearn.linear_model import LinearRegression
 import pandas as pd
 import pickle
 sys.path.append(os.getcwd())
  
 from model_training.house_model import HousePriceModel
+from model_serving.feedback_log import FeedbackLog
+from feature_store.entity_loader import ParquetEntityLoader
+from model_training.house_model import MODEL_PATH
+from model_training.incremental import IncrementalLinearTrainer, STATS_PATH
+
+# Parquet feedback log written by HouseService, plus CSV feedback (the committed history and
+# HOUSE_SERVICE_FEEDBACK_FORMAT=csv output)
+FEEDBACK_DIR = os.getcwd() + "//model_serving//feedback"
+FEEDBACK_CSV = os.getcwd() + "//model_serving//feedback.csv"
  
  
 class TrainModel():
     def __init__(self):
         self.house_model = HousePriceModel()
  
-    def get_current_features(self):
+    def get_current_features(self, with_timestamp=False):
         features_path = "/data/house_features.parquet"
         target_path = "/data/house_target.parquet"
-        X_hist = pd.read_parquet(os.getcwd() + features_path, columns=["area", "mainroad", "bedrooms"])
-        Y_hist = pd.read_parquet(os.getcwd() + target_path, columns=["price"])
+        # Projected, memory-mapped reads: only the training columns are decoded
+        X_hist = ParquetEntityLoader(os.getcwd() + features_path, columns=["area", "mainroad", "bedrooms"]).read()
+        Y_hist = ParquetEntityLoader(os.getcwd() + target_path, columns=["price", "event_timestamp"] if with_timestamp else ["price"]).read()
         X_hist["price"] = Y_hist["price"]
+        if with_timestamp:
+            X_hist["event_timestamp"] = Y_hist["event_timestamp"]
         return X_hist
  
-    def predict_new_data(self):
-        path = os.getcwd() + "//model_serving//feedback.csv"
-        #path = os.path.join(os.path.abspath(os.path.join(os.getcwd(), os.path.pardir)), "serving/feedback.csv")
-        X_new = pd.read_csv(path)
-        X_new.drop(["event_timestamp", "prediction"], axis=1, inplace=True)
+    def predict_new_data(self, since=None):
         lr_model = self.house_model.load_model()
-        X_new = X_new[lr_model.feature_names_in_]
+        # Only partitions newer than the watermark are read, and only the model's feature columns
+        X_new = FeedbackLog(FEEDBACK_DIR, csv_path=FEEDBACK_CSV).read(since=since, columns=list(lr_model.feature_names_in_))
+        if X_new.empty:
+            print("No new feedback rows")
+            return None
         Y_new = self.house_model.predict(X_new)
         X_new["proxy_target"] = Y_new
         return X_new  
  
     def create_and_train_new_dataset_with_target(self, X_hist, X_new):  
-        new_data_combined = X_new.copy()
-        new_data_combined["price"] = new_data_combined["proxy_target"]      
         historical_data_combined = X_hist.copy()
-        combined_data = pd.concat([historical_data_combined, new_data_combined], ignore_index=True)
-        X_combined = combined_data.drop(columns=["price", "proxy_target"])
+        if X_new is None:
+            # Nothing to add: retrain on the historical data alone
+            combined_data = historical_data_combined
+        else:
+            new_data_combined = X_new.copy()
+            new_data_combined["price"] = new_data_combined["proxy_target"]      
+            combined_data = pd.concat([historical_data_combined, new_data_combined], ignore_index=True)
+        X_combined = combined_data.drop(columns=["price", "proxy_target"], errors="ignore")
         y_combined = combined_data["price"]
         print(combined_data)
         #self.train_model(X_combined, y_combined)
         self.house_model.train_model(X_combined, y_combined, test_size=0.1)
         print("Model re-trained and saved as model.pkl")
  
+    def incremental_retrain(self, stats_path=STATS_PATH, mode=None, window_days=None, half_life_days=None, verify=False):
+        # Folds only feedback past the stored log position into the running statistics and re-solves;
+        # the historical set is read once, when no statistics exist yet. Feedback rows are labelled with the
+        # prediction logged at serving time, so every fold is reproducible by a full refit.
+        feedback = FeedbackLog(FEEDBACK_DIR, csv_path=FEEDBACK_CSV)
+        if os.path.exists(stats_path):
+            trainer = IncrementalLinearTrainer.load(stats_path)
+            # The saved statistics were aged under their own config; options given now must agree with it
+            requested = {"mode": mode, "window_days": window_days, "half_life_days": half_life_days}
+            conflicts = {
+                name: (value, getattr(trainer, name)) for name, value in requested.items()
+                if value is not None and value != getattr(trainer, name)
+            }
+            if conflicts:
+                details = ", ".join(f"{name}={value} (saved {saved})" for name, (value, saved) in conflicts.items())
+                raise ValueError(
+                    f"{details} differ from the statistics in {stats_path}; drop the options or delete the file to rebuild"
+                )
+        else:
+            trainer = IncrementalLinearTrainer.from_model(
+                self.house_model.load_model(), mode=mode or "full", window_days=window_days, half_life_days=half_life_days
+            )
+            X_hist = self.get_current_features(with_timestamp=True)
+            trainer.fold(X_hist, X_hist["price"], timestamps=X_hist["event_timestamp"])
+            print(f"Initialised sufficient statistics from {len(X_hist)} historical rows")
+
+        columns = trainer.feature_names + ["prediction", "event_timestamp"]
+        X_new, position = feedback.read_after(trainer.position, columns=columns)
+        if len(X_new):
+            trainer.fold(X_new, X_new["prediction"], timestamps=X_new["event_timestamp"])
+        trainer.position = position
+        print(f"Folded {len(X_new)} new feedback rows, {trainer.count:.0f} rows in the statistics")
+
+        if verify:
+            # Reads the full history again and refits from scratch
+            X_hist = self.get_current_features(with_timestamp=True)
+            X_all = feedback.read(columns=columns).rename(columns={"prediction": "price"})
+            X_all = pd.concat([X_hist, X_all[X_hist.columns]], ignore_index=True)
+            print(f"Verification against a full refit: {trainer.verify_against_refit(X_all, X_all['price'], X_all['event_timestamp'])}")
+
+        # Solved before anything is written: if too little data is left the current model and statistics stay
+        model = trainer.to_estimator()
+        trainer.prune()
+        trainer.save(stats_path)
+        with open(MODEL_PATH, "wb") as f:
+            pickle.dump(model, f)
+        print("Model incrementally re-trained and saved as model.pkl")
+        return model
+
     def train_model(self, x, y):
         self.params = {
             "fit_intercept": True,
@@ -57,7 +123,18 @@ class TrainModel():
  
  
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrain the house price model with serving feedback")
+    parser.add_argument("--incremental", action="store_true", help="Fold only new feedback into stored sufficient statistics")
+    parser.add_argument("--mode", type=str, choices=["full", "window", "decay"], help="How old data ages out (incremental only, default full; must match existing statistics)")
+    parser.add_argument("--window_days", type=float, help="Days of data kept in window mode")
+    parser.add_argument("--half_life_days", type=float, help="Half-life of a row's weight in decay mode")
+    parser.add_argument("--verify", action="store_true", help="Compare the incremental model with a full refit")
+    args = parser.parse_args()
+
     t = TrainModel()
-    X_hist = t.get_current_features()
-    X_new = t.predict_new_data()
-    t.create_and_train_new_dataset_with_target(X_hist, X_new)
+    if args.incremental:
+        t.incremental_retrain(mode=args.mode, window_days=args.window_days, half_life_days=args.half_life_days, verify=args.verify)
+    else:
+        X_hist = t.get_current_features()
+        X_new = t.predict_new_data()
+        t.create_and_train_new_dataset_with_target(X_hist, X_new)
@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+import mlflow
+from mlflow.models.signature import infer_signature
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from model_serving.fast_path import MLFLOW_MODEL_FOLDER, LinearScorer, load_fast_path, verify_parity
+from model_training.house_model import fold_scaler
+
+
+class LocalBentoModel:
+    # The parts of a Bento model load_fast_path reads: an MLflow model folder and a tag
+    def __init__(self, root: str, tag: str):
+        self.root = root
+        self.tag = tag
+
+    def path_of(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+
+def save_bento_model(estimator, x, tmp_path) -> tuple:
+    path = os.path.join(str(tmp_path), MLFLOW_MODEL_FOLDER)
+    signature = infer_signature(x, estimator.predict(x))
+    mlflow.sklearn.save_model(
+        estimator, path, signature=signature, pip_requirements=["scikit-learn"],
+        serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE
+    )
+    return LocalBentoModel(str(tmp_path), "house_price_model:test"), mlflow.pyfunc.load_model(path)
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    x = np.column_stack([rng.integers(1, 6, 300), rng.integers(0, 2, 300), rng.uniform(1500, 16000, 300)]).astype(float)
+    y = 40000 * x[:, 0] + 90000 * x[:, 1] + 3 * x[:, 2] + rng.normal(0, 1000, 300)
+    return x, y
+
+
+@pytest.mark.parametrize("estimator", [LinearRegression(), LinearRegression(fit_intercept=False), Ridge(alpha=10.0)])
+def test_scorer_matches_sklearn(estimator, data):
+    x, y = data
+    estimator.fit(x, y)
+    scorer = LinearScorer.from_estimator(estimator)
+    np.testing.assert_allclose(scorer.predict(x), estimator.predict(x), rtol=1e-10)
+    np.testing.assert_allclose(scorer.predict(x[0]), estimator.predict(x[:1]), rtol=1e-10)
+    assert verify_parity(scorer, estimator)
+
+
+@pytest.mark.parametrize("estimator", [Ridge(alpha=10.0), Ridge(alpha=1.0, fit_intercept=False), Lasso(alpha=10.0), ElasticNet(alpha=0.1)])
+def test_folded_scaler_serves_on_raw_features(estimator, data):
+    # Halving search fits penalised models on standardised features; the served model takes raw features
+    x, y = data
+    pipeline = Pipeline([("scaler", StandardScaler()), ("model", estimator)]).fit(x, y)
+    folded = fold_scaler(pipeline.named_steps["scaler"], pipeline.named_steps["model"])
+    np.testing.assert_allclose(folded.predict(x), pipeline.predict(x), rtol=1e-9)
+    scorer = LinearScorer.from_estimator(folded)
+    np.testing.assert_allclose(scorer.predict(x), pipeline.predict(x), rtol=1e-9)
+
+
+def test_load_fast_path_matches_pyfunc(data, tmp_path):
+    x, y = data
+    estimator = LinearRegression().fit(x, y)
+    bento_model, pyfunc_model = save_bento_model(estimator, x, tmp_path)
+    scorer = load_fast_path(bento_model, pyfunc_model)
+    assert isinstance(scorer, LinearScorer)
+    np.testing.assert_allclose(scorer.predict(x), np.asarray(pyfunc_model.predict(x)).reshape(-1), rtol=1e-10)
+
+
+def test_multi_output_keeps_sklearn_path(data):
+    x, y = data
+    estimator = LinearRegression().fit(x, np.column_stack([y, 2 * y]))
+    assert LinearScorer.from_estimator(estimator) is None
+
+
+def test_single_target_2d_fit_uses_scorer(data):
+    x, y = data
+    estimator = LinearRegression().fit(x, y.reshape(-1, 1))
+    scorer = LinearScorer.from_estimator(estimator)
+    np.testing.assert_allclose(scorer.predict(x), estimator.predict(x).reshape(-1), rtol=1e-10)
+
+
+def test_non_linear_model_falls_back_to_pyfunc(data, tmp_path):
+    x, y = data
+    estimator = RandomForestRegressor(n_estimators=5, random_state=0).fit(x, y)
+    assert LinearScorer.from_estimator(estimator) is None
+    bento_model, pyfunc_model = save_bento_model(estimator, x, tmp_path)
+    assert load_fast_path(bento_model, pyfunc_model) is None
+
+
+def test_parity_check_rejects_mismatch(data):
+    x, y = data
+    estimator = LinearRegression().fit(x, y)
+    scorer = LinearScorer(estimator.coef_ * 1.01, estimator.intercept_)
+    assert not verify_parity(scorer, estimator)
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import mlflow
+from mlflow.models.signature import infer_signature
+from sklearn.linear_model import LinearRegression
+
+from model_serving.fast_path import LinearScorer, model_feature_names
+from model_serving.feedback_log import FeedbackLog, ParquetFeedbackWriter
+from model_serving.feedback_sink import CSVFeedbackWriter, feedback_rows
+
+TRAINING_ORDER = ["bedrooms", "mainroad", "area"]
+
+
+@pytest.fixture(scope="module")
+def training_frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "bedrooms": rng.integers(1, 6, 200).astype(float),
+        "mainroad": rng.integers(0, 2, 200).astype(float),
+        "area": rng.uniform(1500, 16000, 200),
+    })[TRAINING_ORDER]
+
+
+@pytest.fixture(scope="module")
+def estimator(training_frame):
+    target = 3 * training_frame["area"] + 40000 * training_frame["bedrooms"] + 90000 * training_frame["mainroad"]
+    return LinearRegression().fit(training_frame, target)
+
+
+@pytest.fixture(scope="module")
+def pyfunc_model(estimator, training_frame, tmp_path_factory):
+    # Saved like HousePriceModel.register does, with an unnamed tensor signature
+    path = str(tmp_path_factory.mktemp("model") / "house_price_model")
+    signature = infer_signature(np.array(training_frame), estimator.predict(training_frame))
+    mlflow.sklearn.save_model(estimator, path, signature=signature, pip_requirements=["scikit-learn"])
+    return mlflow.pyfunc.load_model(path)
+
+
+def online_frame(training_frame):
+    # Online features come back in FeatureView order, not in the model's
+    return training_frame[["area", "bedrooms", "mainroad"]]
+
+
+def test_sklearn_feature_names_follow_training_order(estimator, training_frame):
+    names = model_feature_names(estimator)
+    assert names == TRAINING_ORDER
+    input_data = online_frame(training_frame)[names].to_numpy(dtype=np.float64)
+    np.testing.assert_allclose(estimator.predict(input_data), estimator.predict(training_frame), rtol=1e-12)
+
+
+def test_linear_scorer_feature_names_follow_training_order(estimator, training_frame):
+    scorer = LinearScorer.from_estimator(estimator)
+    names = model_feature_names(scorer)
+    assert names == TRAINING_ORDER
+    input_data = online_frame(training_frame)[names].to_numpy(dtype=np.float64)
+    np.testing.assert_allclose(scorer.predict(input_data), estimator.predict(training_frame), rtol=1e-9)
+
+
+def test_pyfunc_feature_names_come_from_wrapped_estimator(pyfunc_model, estimator, training_frame):
+    names = model_feature_names(pyfunc_model)
+    assert names == TRAINING_ORDER
+    input_data = online_frame(training_frame)[names].to_numpy(dtype=np.float64)
+    np.testing.assert_allclose(
+        np.asarray(pyfunc_model.predict(input_data)).reshape(-1), estimator.predict(training_frame), rtol=1e-9
+    )
+
+
+def test_default_when_model_has_no_names():
+    scorer = LinearScorer([1.0, 2.0, 3.0], 0.0)
+    assert model_feature_names(scorer, TRAINING_ORDER) == TRAINING_ORDER
+
+
+def test_feature_view_order_would_score_wrong(estimator, training_frame):
+    # The regression this guards against: positional input in FeatureView order
+    wrong = online_frame(training_frame).to_numpy(dtype=np.float64)
+    assert not np.allclose(estimator.predict(wrong), estimator.predict(training_frame))
+
+
+@pytest.mark.parametrize("log_format", ["parquet", "csv"])
+def test_house_id_lookup_feedback_round_trip(estimator, training_frame, log_format, tmp_path):
+    # A house_id lookup scores in model order; the feedback log must still hold each feature under its own name
+    online = online_frame(training_frame).head(20).reset_index(drop=True)
+    feature_columns = model_feature_names(estimator)
+    input_data = online[feature_columns].to_numpy(dtype=np.float64)
+    pred = estimator.predict(input_data)
+    rows = feedback_rows(datetime(2026, 1, 1, 12), feature_columns, input_data, pred)
+
+    if log_format == "parquet":
+        ParquetFeedbackWriter(str(tmp_path / "feedback")).write(rows)
+        log = FeedbackLog(str(tmp_path / "feedback"))
+    else:
+        CSVFeedbackWriter(str(tmp_path / "feedback.csv")).write(rows)
+        log = FeedbackLog(str(tmp_path / "feedback"), csv_path=str(tmp_path / "feedback.csv"))
+
+    logged = log.read(columns=["area", "bedrooms", "mainroad", "prediction"])
+    pd.testing.assert_frame_equal(logged[["area", "bedrooms", "mainroad"]], online, check_dtype=False)
+    np.testing.assert_allclose(logged["prediction"], pred, rtol=1e-12)
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from model_serving.feedback_log import FeedbackLog, ParquetFeedbackWriter
+from model_serving.feedback_sink import CSVFeedbackWriter
+
+COLUMNS = ["area", "bedrooms", "mainroad", "prediction", "event_timestamp"]
+TIMESTAMP = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def rows(count, area=1000.0, timestamp=TIMESTAMP):
+    return [[timestamp, area + i, 2.0, 1.0, 100.0] for i in range(count)]
+
+
+def test_late_segment_with_seen_timestamp_is_read(tmp_path):
+    # One predict batch split across two flushes: the second segment lands after a reader consumed the first
+    writer = ParquetFeedbackWriter(str(tmp_path))
+    log = FeedbackLog(str(tmp_path))
+    writer.write(rows(3))
+    first, position = log.read_after(None, columns=COLUMNS)
+    assert len(first) == 3
+
+    writer.write(rows(2, area=2000.0))
+    late, position = log.read_after(position, columns=COLUMNS)
+    assert late["area"].tolist() == [2000.0, 2001.0]
+
+    empty, _ = log.read_after(position, columns=COLUMNS)
+    assert empty.empty
+
+
+def test_csv_rows_consumed_once_across_rotation(tmp_path):
+    csv_path = str(tmp_path / "feedback.csv")
+    writer = CSVFeedbackWriter(csv_path, max_bytes=0)
+    log = FeedbackLog(str(tmp_path / "feedback"), csv_path=csv_path)
+    writer.write(rows(2))
+    first, position = log.read_after(None, columns=COLUMNS)
+    assert len(first) == 2
+
+    # The rotated file keeps its inode, so its rows are not read again
+    writer.write(rows(1, area=3000.0))
+    writer.rotate()
+    writer.write(rows(1, area=4000.0))
+    new, position = log.read_after(position, columns=COLUMNS)
+    assert sorted(new["area"].tolist()) == [3000.0, 4000.0]
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_training.incremental import IncrementalLinearTrainer
+
+FEATURES = ["area", "bedrooms", "mainroad"]
+
+
+def history(timestamp):
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame({"area": rng.uniform(1500, 16000, 50), "bedrooms": rng.integers(1, 6, 50).astype(float),
+                      "mainroad": rng.integers(0, 2, 50).astype(float)})
+    return x, 3 * x["area"] + 40000 * x["bedrooms"], [timestamp] * len(x)
+
+
+def test_aged_out_window_refuses_to_solve():
+    # With every bucket outside the window the statistics are empty; an all-zero model must not come out
+    trainer = IncrementalLinearTrainer(FEATURES, mode="window", window_days=1)
+    trainer.fold(*history(datetime.now(timezone.utc) - timedelta(days=30)))
+    with pytest.raises(ValueError, match="weighted rows"):
+        trainer.to_estimator()
+
+
+def test_recent_window_solves():
+    trainer = IncrementalLinearTrainer(FEATURES, mode="window", window_days=1)
+    x, y, timestamps = history(datetime.now(timezone.utc))
+    trainer.fold(x, y, timestamps)
+    np.testing.assert_allclose(trainer.to_estimator().predict(x), y, rtol=1e-6)
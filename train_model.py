@@ -1,39 +1,68 @@
 import os
+import argparse
 import pandas as pd
 from feature_store.feature_store import FeastFeatureStore
 from feature_store.exec_feature_store import ExecuteFeatureStore
 
 from create_online_feature import CreateOnlineFeatures
 from model_training.house_model import HousePriceModel
+from model_training.streaming import iter_parquet_batches, iter_offline_batches
+from feature_store.resource_registry import resources
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 
 if __name__ == "__main__":
-    create_online_feature = CreateOnlineFeatures()
-
-    feature_store_path = os.path.join(str(PROJECT_ROOT) + "/feature_store/feature_repo")
-    create_online_feature.set_feature_store(feature_store_path)
-
-    online_datasource_path = os.path.join(str(PROJECT_ROOT) + "/data/house_target.parquet")
-    create_online_feature.set_entity_df(online_datasource_path)
-
-    entity_df = create_online_feature.get_entity_df()
-    target = entity_df["price"]
-    print(target)
-
-    # online_df = create_online_feature.get_online_df()
-    online_df = pd.read_csv("data/Housing_processed.csv")
-    # online_features = online_df.drop(labels=["house_id"], axis=1)
-    online_features = online_df[["bedrooms",  "mainroad", "area"]]
-    # online_features.dropna()
-    print(online_features)
-
-    model = HousePriceModel()
-    model.train_model(features=online_features, target=target)
-    print("Model trained\n")
-    model.configure_mlflow()
-    print("MLflow configured successfully\n")
-    model_info = model.register()
-    print("Model registered successfully\n")
-    print(f"Model URI: {model_info.model_uri}")
+    parser = argparse.ArgumentParser(description="Train and register the house price model")
+    parser.add_argument("--search", type=str, default="grid", choices=["grid", "halving", "closed_form"], help="Hyperparameter search mode")
+    parser.add_argument("--log_models", action="store_true", help="Also upload a model artifact for every searched candidate, in the background")
+    parser.add_argument("--streaming", type=str, choices=["parquet", "offline"], help="Train out of core on record batches from Parquet files or the offline store")
+    parser.add_argument("--batch_size", type=int, default=100_000, help="Rows per streamed batch")
+    args = parser.parse_args()
+
+    if args.streaming:
+        feature_names = ["bedrooms", "mainroad", "area"]
+        if args.streaming == "parquet":
+            batches = iter_parquet_batches(
+                os.path.join(str(PROJECT_ROOT) + "/data/house_features.parquet"),
+                os.path.join(str(PROJECT_ROOT) + "/data/house_target.parquet"),
+                columns=["house_id"] + feature_names,
+                batch_size=args.batch_size
+            )
+        else:
+            engine = resources.get_engine(ExecuteFeatureStore().get_offline_connstr())
+            batches = iter_offline_batches(engine, feature_names, batch_size=args.batch_size)
+
+        model = HousePriceModel()
+        model.train_streaming(batches, feature_names)
+        model.configure_mlflow()
+        model_info = model.register_streaming()
+        print(f"Model URI: {model_info.model_uri}")
+    else:
+        create_online_feature = CreateOnlineFeatures()
+
+        feature_store_path = os.path.join(str(PROJECT_ROOT) + "/feature_store/feature_repo")
+        create_online_feature.set_feature_store(feature_store_path)
+
+        online_datasource_path = os.path.join(str(PROJECT_ROOT) + "/data/house_target.parquet")
+        create_online_feature.set_entity_df(online_datasource_path, columns=["house_id", "event_timestamp", "price"])
+
+        entity_df = create_online_feature.get_entity_df()
+        target = entity_df["price"]
+        print(target)
+
+        # online_df = create_online_feature.get_online_df()
+        online_df = pd.read_csv("data/Housing_processed.csv")
+        # online_features = online_df.drop(labels=["house_id"], axis=1)
+        online_features = online_df[["bedrooms",  "mainroad", "area"]]
+        # online_features.dropna()
+        print(online_features)
+
+        model = HousePriceModel()
+        model.train_model(features=online_features, target=target, search=args.search)
+        print("Model trained\n")
+        model.configure_mlflow()
+        print("MLflow configured successfully\n")
+        model_info = model.register(log_models=args.log_models)
+        print("Model registered successfully\n")
+        print(f"Model URI: {model_info.model_uri}")
 